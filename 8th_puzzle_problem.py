@@ -1,79 +1,544 @@
 from collections import deque
+import heapq
+import mmap
+import multiprocessing
+import os
 import time
 
+import numpy as np
+
+# Blank moves, in the same order as PuzzleSolver.row_moves / col_moves.
+MOVE_NAMES = ["U", "D", "L", "R"]
+
+def _map_table(path, size, write):
+    """Memory-maps the `size`-byte table at `path`.
+
+    A missing file, or one of the wrong size left by an interrupted build,
+    is (re)built first: write(f) fills a temporary file that is then renamed
+    over `path`, so a crash never leaves a partial table behind.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) != size:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    with open(path, "rb") as f:
+        table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(table) != size:
+        found = len(table)
+        table.close()
+        raise ValueError(f"{path}: expected a {size}-byte table, found {found} bytes")
+    return table
+
 def print_board(board):
     print("-------")
     for row in board:
         print(row)
     print("-------")
 
+class SearchResult:
+    """Outcome of a search: the blank's moves plus search counters."""
+    def __init__(self, moves, nodes_expanded, elapsed):
+        self.moves = moves
+        self.nodes_expanded = nodes_expanded
+        self.elapsed = elapsed
+
+    @property
+    def depth(self):
+        return len(self.moves)
+
+    @property
+    def time_per_node(self):
+        return self.elapsed / self.nodes_expanded if self.nodes_expanded else 0.0
+
+class ManhattanHeuristic:
+    """Sum over tiles of the row and column distance to their goal cell."""
+    def __init__(self, solver):
+        self.num_cells = solver.num_cells
+        self.cell_bits = solver.cell_bits
+        self.cell_mask = solver.cell_mask
+        size = solver.size
+        goal_cell = {tile: cell for cell, tile in enumerate(t for row in solver.goal_state for t in row)}
+        # dist[tile][cell]; the blank never contributes.
+        self.dist = [[0] * self.num_cells for _ in range(self.num_cells)]
+        for tile in range(1, self.num_cells):
+            gx, gy = divmod(goal_cell[tile], size)
+            for cell in range(self.num_cells):
+                x, y = divmod(cell, size)
+                self.dist[tile][cell] = abs(x - gx) + abs(y - gy)
+
+    def __call__(self, state):
+        dist, mask, bits = self.dist, self.cell_mask, self.cell_bits
+        total = 0
+        for cell in range(self.num_cells):
+            total += dist[state & mask][cell]
+            state >>= bits
+        return total
+
+class LinearConflictHeuristic(ManhattanHeuristic):
+    """Manhattan distance plus two moves for every tile that has to leave its
+    goal row or column to let another tile in the same line pass it."""
+    def __init__(self, solver):
+        super().__init__(solver)
+        self.size = solver.size
+
+    @staticmethod
+    def _removals(goal_positions):
+        # Tiles to lift out of a line = line length - longest increasing run.
+        tails = []
+        for pos in goal_positions:
+            lo, hi = 0, len(tails)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if tails[mid] < pos:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            tails[lo:lo + 1] = [pos]
+        return len(goal_positions) - len(tails)
+
+    def __call__(self, state):
+        size, mask, bits = self.size, self.cell_mask, self.cell_bits
+        tiles = [(state >> (cell * bits)) & mask for cell in range(self.num_cells)]
+        total = super().__call__(state)
+        for line in range(size):
+            row_goals = []
+            col_goals = []
+            for k in range(size):
+                tile = tiles[line * size + k]
+                if tile and (tile - 1) // size == line:
+                    row_goals.append((tile - 1) % size)
+                tile = tiles[k * size + line]
+                if tile and (tile - 1) % size == line:
+                    col_goals.append((tile - 1) // size)
+            total += 2 * (self._removals(row_goals) + self._removals(col_goals))
+        return total
+
+class PatternDatabase:
+    """Additive pattern database over disjoint groups of tiles.
+
+    Each group's table stores, for every placement of its tiles, the fewest
+    moves of *those* tiles needed to reach the goal, so the per-group values
+    can be summed and still never overestimate. Tables are indexed by
+    sum(cell * num_cells ** j) over the group's tiles, built once with a 0-1
+    BFS, written to `path` and memory-mapped on later loads.
+    """
+    def __init__(self, solver, groups=None, path=None):
+        self.num_cells = solver.num_cells
+        self.cell_bits = solver.cell_bits
+        self.cell_mask = solver.cell_mask
+        self.goal_cells = {tile: cell for cell, tile in enumerate(t for row in solver.goal_state for t in row)}
+        self.neighbours = [[t[cell] for t in solver.move_table if t[cell] >= 0]
+                           for cell in range(self.num_cells)]
+        if groups is None:
+            groups = self.default_groups(self.num_cells)
+        self.groups = [tuple(g) for g in groups]
+        if path is None:
+            path = "pdb_{0}x{0}_{1}.bin".format(
+                solver.size, "_".join("-".join(map(str, g)) for g in self.groups))
+        self.path = path
+
+        # tile -> (group index, index weight) for the lookup loop.
+        self.tile_weight = [(0, 0)] * self.num_cells
+        for g, group in enumerate(self.groups):
+            for j, tile in enumerate(group):
+                self.tile_weight[tile] = (g, self.num_cells ** j)
+        self.offsets = []
+        offset = 0
+        for group in self.groups:
+            self.offsets.append(offset)
+            offset += self.num_cells ** len(group)
+
+        self.table = _map_table(self.path, offset, self._write_tables)
+
+    def _write_tables(self, f):
+        for group in self.groups:
+            f.write(self._build_table(group))
+
+    @staticmethod
+    def default_groups(num_cells, max_entries=1 << 25):
+        """Row-major chunks of tiles, as large as the BFS bitmap budget allows."""
+        group_size = 1
+        while group_size < num_cells - 1 and num_cells ** (group_size + 2) <= max_entries:
+            group_size += 1
+        tiles = list(range(1, num_cells))
+        return [tiles[i:i + group_size] for i in range(0, len(tiles), group_size)]
+
+    def _build_table(self, group):
+        n = self.num_cells
+        k = len(group)
+        weights = [n ** j for j in range(k)]
+        table = bytearray(b"\xff") * (n ** k)
+        seen = bytearray(n ** (k + 1))   # (placement index, blank cell)
+        neighbours = self.neighbours
+
+        positions = tuple(self.goal_cells[tile] for tile in group)
+        frontier = [(positions, self.goal_cells[0])]
+        cost = 0
+        while frontier:
+            next_frontier = []
+            stack = []
+            for positions, blank in frontier:
+                index = sum(p * w for p, w in zip(positions, weights))
+                if not seen[index * n + blank]:
+                    seen[index * n + blank] = 1
+                    stack.append((positions, index, blank))
+            # Blank moves over non-group cells cost nothing for this group.
+            while stack:
+                positions, index, blank = stack.pop()
+                if table[index] == 255:
+                    table[index] = cost
+                for nb in neighbours[blank]:
+                    if nb in positions:
+                        j = positions.index(nb)
+                        moved = positions[:j] + (blank,) + positions[j + 1:]
+                        next_frontier.append((moved, nb))
+                    elif not seen[index * n + nb]:
+                        seen[index * n + nb] = 1
+                        stack.append((positions, index, nb))
+            frontier = next_frontier
+            cost += 1
+        return table
+
+    def __call__(self, state):
+        indices = [0] * len(self.groups)
+        mask, bits, tile_weight = self.cell_mask, self.cell_bits, self.tile_weight
+        for cell in range(self.num_cells):
+            g, weight = tile_weight[state & mask]
+            indices[g] += cell * weight
+            state >>= bits
+        table = self.table
+        return sum(table[offset + index] for offset, index in zip(self.offsets, indices))
+
+HEURISTICS = {
+    "manhattan": ManhattanHeuristic,
+    "linear_conflict": LinearConflictHeuristic,
+    "pdb": PatternDatabase,
+}
+
 class PuzzleSolver:
     def __init__(self, start_board, start_x, start_y):
+        self.size = len(start_board)
+        self.num_cells = self.size * self.size
+        # Each cell is packed into a fixed-width bit field (a nibble up to 4x4).
+        self.cell_bits = max(4, (self.num_cells - 1).bit_length())
+        self.cell_mask = (1 << self.cell_bits) - 1
+
         self.start_board = start_board
         self.start_x = start_x
         self.start_y = start_y
-        self.goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+        self.goal_state = [[r * self.size + c + 1 for c in range(self.size)]
+                           for r in range(self.size)]
+        self.goal_state[-1][-1] = 0
         self.row_moves = [-1, 1, 0, 0] 
         self.col_moves = [0, 0, -1, 1] 
 
+        # move_table[i][cell] is the cell the blank moves to, or -1 if off-board.
+        self.move_table = []
+        for i in range(4):
+            targets = []
+            for cell in range(self.num_cells):
+                new_x = cell // self.size + self.row_moves[i]
+                new_y = cell % self.size + self.col_moves[i]
+                targets.append(new_x * self.size + new_y if self._is_valid(new_x, new_y) else -1)
+            self.move_table.append(targets)
+
+        self.start_state = self.encode(start_board)
+        self.start_blank = start_x * self.size + start_y
+        self.goal = self.encode(self.goal_state)
+
+    def encode(self, board):
+        """Packs a board into an int, one cell_bits-wide field per cell."""
+        state = 0
+        for cell, tile in enumerate(t for row in board for t in row):
+            state |= tile << (cell * self.cell_bits)
+        return state
+
+    def decode(self, state):
+        """Unpacks an int state back into a list-of-lists board."""
+        tiles = [(state >> (cell * self.cell_bits)) & self.cell_mask
+                 for cell in range(self.num_cells)]
+        return [tiles[r * self.size:(r + 1) * self.size] for r in range(self.size)]
+
+    def _apply_move(self, state, blank, target):
+        """Slides the tile at `target` into the blank cell using XORs."""
+        tile = (state >> (target * self.cell_bits)) & self.cell_mask
+        return state ^ (tile << (target * self.cell_bits)) ^ (tile << (blank * self.cell_bits))
+
     def _is_valid(self, x, y):
-        """Checks if (x, y) is on the 3x3 board."""
-        return 0 <= x < 3 and 0 <= y < 3
+        """Checks if (x, y) is on the board."""
+        return 0 <= x < self.size and 0 <= y < self.size
+
+    def _is_goal(self, state):
+        """Checks if the packed state is the goal state."""
+        return state == self.goal
+
+    def is_solvable(self):
+        """Inversion-parity test, O(n^2) in the number of tiles.
+
+        On odd-width boards every move keeps the inversion parity; on even
+        widths a vertical move flips it together with the blank's row, so
+        inversions + blank rows from the bottom must be even.
+        """
+        tiles = [t for row in self.start_board for t in row if t != 0]
+        inversions = sum(1 for i in range(len(tiles))
+                         for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+        if self.size % 2 == 1:
+            return inversions % 2 == 0
+        return (inversions + (self.size - 1 - self.start_x)) % 2 == 0
+
+    def _walk_back(self, parents, state, blank):
+        """Follows the move indices in `parents` back to the search root.
 
-    def _is_goal(self, board):
-        """Checks if the board is the goal state."""
-        return board == self.goal_state
+        Returns the moves taken from the root to `state`, in order.
+        """
+        moves = []
+        while parents[state] >= 0:
+            i = parents[state]
+            moves.append(MOVE_NAMES[i])
+            # i ^ 1 is the opposite move (U<->D, L<->R).
+            prev_blank = self.move_table[i ^ 1][blank]
+            state = self._apply_move(state, blank, prev_blank)
+            blank = prev_blank
+        moves.reverse()
+        return moves
 
     def _search_loop(self, data_structure, pop_method, move_indices, algo_name):
         
-        data_structure.append((self.start_board, self.start_x, self.start_y, 0))
+        data_structure.append((self.start_state, self.start_blank, 0))
         
-        visited = set()
-        visited.add(tuple(map(tuple, self.start_board))) 
+        # state -> index of the move that first reached it (-1 for the start).
+        visited = {self.start_state: -1}
 
         print(f'Initial State ({algo_name}):')
         print_board(self.start_board)
         print(f"\nStarting {algo_name} Search...\n")
 
+        move_table = self.move_table
+        apply_move = self._apply_move
        
         while data_structure:
           
-            curr_board, curr_x, curr_y, curr_depth = pop_method()
+            curr_state, curr_blank, curr_depth = pop_method()
             
          
-            if self._is_goal(curr_board):
+            if self._is_goal(curr_state):
                 print(f"--- Goal Found! ({algo_name}) ---")
                 print(f"Final board state:")
-                print_board(curr_board) 
+                print_board(self.decode(curr_state)) 
                 print(f"Solved in {curr_depth} moves.")
                 print(f"Total states explored: {len(visited)}")
-                return # Solution found!
+                return self._walk_back(visited, curr_state, curr_blank), len(visited)
 
          
             for i in move_indices:
-                new_x = curr_x + self.row_moves[i]
-                new_y = curr_y + self.col_moves[i]
+                new_blank = move_table[i][curr_blank]
 
-                if self._is_valid(new_x, new_y):
-                   
-                    new_board = [row[:] for row in curr_board]
-                    
-                  
-                    new_board[curr_x][curr_y], new_board[new_x][new_y] = \
-                        new_board[new_x][new_y], new_board[curr_x][curr_y]
+                if new_blank >= 0:
+                    new_state = apply_move(curr_state, curr_blank, new_blank)
 
-                    new_board_tuple = tuple(map(tuple, new_board))
-
-                    if new_board_tuple not in visited:
-                        visited.add(new_board_tuple)
-                        data_structure.append((new_board, new_x, new_y, curr_depth + 1))
+                    if new_state not in visited:
+                        visited[new_state] = i
+                        data_structure.append((new_state, new_blank, curr_depth + 1))
 
         
         print(f"No solution found ({algo_name}).")
         print(f"Total states explored: {len(visited)}")
+        return None, len(visited)
+
+    def _bidirectional_bfs(self):
+        """BFS from the start and the goal at once, always growing the
+        smaller frontier by one full layer until the two searches meet."""
+        move_table = self.move_table
+        apply_move = self._apply_move
+        goal_blank = self.num_cells - 1
+        forward = {self.start_state: -1}
+        backward = {self.goal: -1}
+        forward_layer = [(self.start_state, self.start_blank)]
+        backward_layer = [(self.goal, goal_blank)]
+
+        if self.start_state == self.goal:
+            return [], 1
+
+        while forward_layer and backward_layer:
+            expand_forward = len(forward_layer) <= len(backward_layer)
+            if expand_forward:
+                layer, seen, other = forward_layer, forward, backward
+            else:
+                layer, seen, other = backward_layer, backward, forward
+
+            next_layer = []
+            meetings = []
+            for state, blank in layer:
+                for i in range(4):
+                    new_blank = move_table[i][blank]
+                    if new_blank < 0:
+                        continue
+                    new_state = apply_move(state, blank, new_blank)
+                    if new_state in seen:
+                        continue
+                    seen[new_state] = i
+                    next_layer.append((new_state, new_blank))
+                    if new_state in other:
+                        meetings.append((new_state, new_blank))
+
+            if meetings:
+                # Finish the layer first: the other side's depths differ by
+                # one across its visited set, so the first hit may not be best.
+                best = None
+                for state, blank in meetings:
+                    moves = self._walk_back(forward, state, blank)
+                    back = self._walk_back(backward, state, blank)
+                    # Replay the goal-side moves from the meeting state, inverted.
+                    moves += [MOVE_NAMES[MOVE_NAMES.index(m) ^ 1] for m in reversed(back)]
+                    if best is None or len(moves) < len(best):
+                        best = moves
+                return best, len(forward) + len(backward)
+
+            if expand_forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        return None, len(forward) + len(backward)
+
+    def _moves_from_parents(self, parent, state):
+        moves = []
+        while parent[state] is not None:
+            state, i = parent[state]
+            moves.append(MOVE_NAMES[i])
+        moves.reverse()
+        return moves
+
+    def _astar(self, heuristic):
+        move_table = self.move_table
+        apply_move = self._apply_move
+        g_score = {self.start_state: 0}
+        parent = {self.start_state: None}   # state -> (previous state, move index)
+        # Ties on f are broken towards deeper nodes via -g.
+        heap = [(heuristic(self.start_state), 0, self.start_state, self.start_blank)]
+        nodes_expanded = 0
+
+        while heap:
+            _, neg_g, state, blank = heapq.heappop(heap)
+            g = -neg_g
+            if g > g_score[state]:
+                continue   # stale entry, a shorter path was found later
+            if self._is_goal(state):
+                return self._moves_from_parents(parent, state), nodes_expanded
+            nodes_expanded += 1
+
+            for i in range(4):
+                new_blank = move_table[i][blank]
+                if new_blank < 0:
+                    continue
+                new_state = apply_move(state, blank, new_blank)
+                if g + 1 < g_score.get(new_state, float("inf")):
+                    g_score[new_state] = g + 1
+                    parent[new_state] = (state, i)
+                    heapq.heappush(heap, (g + 1 + heuristic(new_state), -(g + 1), new_state, new_blank))
+        return None, nodes_expanded
+
+    def _idastar(self, heuristic):
+        move_table = self.move_table
+        apply_move = self._apply_move
+        goal = self.goal
+        moves = []
+        nodes_expanded = 0
+
+        def search(state, blank, g, bound, prev_blank):
+            nonlocal nodes_expanded
+            f = g + heuristic(state)
+            if f > bound:
+                return f
+            if state == goal:
+                return True
+            nodes_expanded += 1
+            minimum = float("inf")
+            for i in range(4):
+                new_blank = move_table[i][blank]
+                # Never undo the previous move.
+                if new_blank < 0 or new_blank == prev_blank:
+                    continue
+                moves.append(i)
+                t = search(apply_move(state, blank, new_blank), new_blank, g + 1, bound, blank)
+                if t is True:
+                    return True
+                moves.pop()
+                minimum = min(minimum, t)
+            return minimum
+
+        bound = heuristic(self.start_state)
+        while True:
+            t = search(self.start_state, self.start_blank, 0, bound, -1)
+            if t is True:
+                return [MOVE_NAMES[i] for i in moves], nodes_expanded
+            if t == float("inf"):
+                return None, nodes_expanded
+            bound = t
+
+    def _informed_search(self, algorithm, heuristic):
+        algo_name = "A*" if algorithm == 'astar' else "IDA*"
+        if isinstance(heuristic, str):
+            heuristic = HEURISTICS[heuristic](self)
+
+        print(f'Initial State ({algo_name}):')
+        print_board(self.start_board)
+        print(f"\nStarting {algo_name} Search...\n")
+
+        started = time.perf_counter()
+        search = self._astar if algorithm == 'astar' else self._idastar
+        moves, nodes_expanded = search(heuristic)
+        result = SearchResult(moves, nodes_expanded, time.perf_counter() - started)
+
+        if moves is None:
+            print(f"No solution found ({algo_name}).")
+            print(f"Nodes expanded: {nodes_expanded}")
+            return None
+        print(f"--- Goal Found! ({algo_name}) ---")
+        print(f"Solved in {result.depth} moves: {' '.join(moves)}")
+        print(f"Nodes expanded: {nodes_expanded} "
+              f"({result.time_per_node * 1e6:.2f} us/node, {result.elapsed:.3f} s total)")
+        return result
+
+    def _bidirectional_search(self):
+        algo_name = "Bidirectional BFS"
+        print(f'Initial State ({algo_name}):')
+        print_board(self.start_board)
+        print(f"\nStarting {algo_name} Search...\n")
+
+        started = time.perf_counter()
+        moves, explored = self._bidirectional_bfs()
+        result = SearchResult(moves, explored, time.perf_counter() - started)
+
+        if moves is None:
+            print(f"No solution found ({algo_name}).")
+            print(f"Total states explored: {explored}")
+            return None
+        print(f"--- Goal Found! ({algo_name}) ---")
+        print(f"Solved in {result.depth} moves: {' '.join(moves)}")
+        print(f"Total states explored: {explored}")
+        return result
+
+    def solve(self, algorithm='bfs', heuristic='manhattan'):
+        """Runs the chosen search and returns a SearchResult, or None when
+        the board has no solution. Unsolvable boards are rejected by the
+        parity check before any search starts.
+
+        'astar' and 'idastar' take a heuristic name from HEURISTICS or any
+        admissible callable on packed states.
+        """
+        if not self.is_solvable():
+            print("Start board is not solvable (inversion parity mismatch).")
+            print_board(self.start_board)
+            return None
+
+        if algorithm.lower() in ('astar', 'idastar'):
+            return self._informed_search(algorithm.lower(), heuristic)
+
+        if algorithm.lower() == 'bidirectional':
+            return self._bidirectional_search()
 
-    def solve(self, algorithm='bfs'):
-       
         if algorithm.lower() == 'dfs':
            
             data_structure = [] 
@@ -93,18 +558,161 @@ class PuzzleSolver:
             algo_name = "BFS"
             
       
-        self._search_loop(data_structure, pop_method, move_indices, algo_name)
+        started = time.perf_counter()
+        moves, explored = self._search_loop(data_structure, pop_method, move_indices, algo_name)
+        if moves is None:
+            return None
+        return SearchResult(moves, explored, time.perf_counter() - started)
+
+class DistanceOracle:
+    """Optimal distance and next move for every solvable 8-puzzle board.
+
+    One backward BFS from the goal fills a byte per permutation rank
+    (Lehmer code over the 9 cells): (distance << 2) | move index of the
+    blank's next move towards the goal, or 0xFF for unreachable boards.
+    The table is written to `path` on first use and memory-mapped after.
+    """
+    UNREACHABLE = 0xFF
+
+    def __init__(self, path="oracle_3x3.bin"):
+        self.path = path
+        self.solver = PuzzleSolver([[1, 2, 3], [4, 5, 6], [7, 8, 0]], 2, 2)
+        self.factorials = [1] * 9
+        for i in range(1, 9):
+            self.factorials[i] = self.factorials[i - 1] * i
+        self.table = _map_table(self.path, self.factorials[8] * 9, lambda f: f.write(self._build_table()))
+        self.entries = np.frombuffer(self.table, dtype=np.uint8)
+
+    def rank(self, tiles):
+        """Lehmer rank of a flat 9-tile sequence, 0 .. 9! - 1."""
+        rank = 0
+        used = 0
+        factorials = self.factorials
+        for i, tile in enumerate(tiles):
+            smaller_used = (used & ((1 << tile) - 1)).bit_count()
+            rank += (tile - smaller_used) * factorials[8 - i]
+            used |= 1 << tile
+        return rank
+
+    def _build_table(self):
+        solver = self.solver
+        move_table = solver.move_table
+        table = bytearray(b"\xff") * self.factorials[8] * 9
+        goal_tiles = [t for row in solver.goal_state for t in row]
+        table[self.rank(goal_tiles)] = 0
+
+        layer = [(goal_tiles, 8)]
+        distance = 0
+        while layer:
+            distance += 1
+            next_layer = []
+            for tiles, blank in layer:
+                for i in range(4):
+                    new_blank = move_table[i][blank]
+                    if new_blank < 0:
+                        continue
+                    new_tiles = tiles[:]
+                    new_tiles[blank], new_tiles[new_blank] = new_tiles[new_blank], 0
+                    rank = self.rank(new_tiles)
+                    if table[rank] == self.UNREACHABLE:
+                        # Undoing move i (i ^ 1) heads back towards the goal.
+                        table[rank] = (distance << 2) | (i ^ 1)
+                        next_layer.append((new_tiles, new_blank))
+            layer = next_layer
+        return table
+
+    def distance(self, board):
+        """Optimal number of moves for `board`, or None if it is unsolvable."""
+        entry = self.table[self.rank([t for row in board for t in row])]
+        return None if entry == self.UNREACHABLE else entry >> 2
+
+    def solve(self, board):
+        """Optimal blank moves for `board` in O(depth) table lookups."""
+        tiles = [t for row in board for t in row]
+        blank = tiles.index(0)
+        entry = self.table[self.rank(tiles)]
+        if entry == self.UNREACHABLE:
+            return None
+        moves = []
+        while entry >> 2:
+            i = entry & 3
+            moves.append(MOVE_NAMES[i])
+            new_blank = self.solver.move_table[i][blank]
+            tiles[blank], tiles[new_blank] = tiles[new_blank], 0
+            blank = new_blank
+            entry = self.table[self.rank(tiles)]
+        return moves
+
+    def batch_ranks(self, tiles):
+        """Lehmer ranks of an (N, 9) array of flat boards, as int64."""
+        tiles = np.asarray(tiles).reshape(-1, 9)
+        ranks = np.zeros(len(tiles), dtype=np.int64)
+        for i in range(8):
+            # Tiles after position i smaller than it: the unused smaller tiles.
+            smaller = (tiles[:, i + 1:] < tiles[:, i:i + 1]).sum(axis=1)
+            ranks += smaller * self.factorials[8 - i]
+        return ranks
+
+    def batch_distances(self, boards, processes=1, chunksize=1 << 20):
+        """Distances for many boards, in order, as an int16 array with -1 for
+        unsolvable boards. `boards` is anything reshapeable to (N, 9); each
+        chunk is ranked and looked up with array operations. With
+        processes > 1 the chunks are sharded across a Pool whose workers
+        each map the table once."""
+        tiles = np.asarray(boards, dtype=np.int8).reshape(-1, 9)
+        chunks = [tiles[i:i + chunksize] for i in range(0, len(tiles), chunksize)]
+        if processes == 1:
+            parts = [self._chunk_distances(chunk) for chunk in chunks]
+        else:
+            with multiprocessing.Pool(processes, _init_oracle_worker, (self.path,)) as pool:
+                parts = pool.map(_oracle_worker_distances, chunks)
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+
+    def _chunk_distances(self, tiles):
+        entries = self.entries[self.batch_ranks(tiles)].astype(np.int16)
+        return np.where(entries == self.UNREACHABLE, -1, entries >> 2)
+
+_worker_oracle = None
+
+def _init_oracle_worker(path):
+    global _worker_oracle
+    _worker_oracle = DistanceOracle(path)
+
+def _oracle_worker_distances(tiles):
+    return _worker_oracle._chunk_distances(tiles)
+
+if __name__ == "__main__":
+    start = [[1, 2, 3],
+             [4, 0, 5],
+             [6, 7, 8]]  
+    x, y = 1, 1
+
+    print("======= RUNNING BFS =======")
+    solver = PuzzleSolver(start, x, y)
+    solver.solve(algorithm='bfs') 
+    print("\n" + "="*30 + "\n")
+
+    print("======= RUNNING DFS =======")
+    solver2 = PuzzleSolver(start, x, y)
+    solver2.solve(algorithm='dfs')
+    print("\n" + "="*30 + "\n")
+
+    print("======= RUNNING A* (linear conflict) =======")
+    solver3 = PuzzleSolver(start, x, y)
+    solver3.solve(algorithm='astar', heuristic='linear_conflict')
+    print("\n" + "="*30 + "\n")
 
-start = [[1, 2, 3],
-         [4, 0, 5],
-         [6, 7, 8]]  
-x, y = 1, 1
+    print("======= RUNNING IDA* (pattern database) =======")
+    solver4 = PuzzleSolver(start, x, y)
+    solver4.solve(algorithm='idastar', heuristic='pdb')
+    print("\n" + "="*30 + "\n")
 
-print("======= RUNNING BFS =======")
-solver = PuzzleSolver(start, x, y)
-solver.solve(algorithm='bfs') 
-print("\n" + "="*30 + "\n")
+    print("======= RUNNING BIDIRECTIONAL BFS =======")
+    solver5 = PuzzleSolver(start, x, y)
+    solver5.solve(algorithm='bidirectional')
+    print("\n" + "="*30 + "\n")
 
-print("======= RUNNING DFS =======")
-solver2 = PuzzleSolver(start, x, y)
-solver2.solve(algorithm='dfs')
\ No newline at end of file
+    print("======= DISTANCE ORACLE =======")
+    oracle = DistanceOracle()
+    print(f"Optimal distance: {oracle.distance(start)}")
+    print(f"Optimal moves: {' '.join(oracle.solve(start))}")
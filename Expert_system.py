@@ -1,3 +1,16 @@
+import argparse
+from collections import OrderedDict, deque
+import hashlib
+import json
+import os
+import pickle
+import sys
+
+from rule_compiler import CompiledRuleBase
+
+# Bump when the pickled RuleBase layout changes, to invalidate old caches.
+CACHE_VERSION = "2"
+
 rules = [
     {"if": ["headache", "fever", "nausea"], "then": "dengue"},
     {"if": ["fever", "cough"], "then": "flu"},
@@ -6,40 +19,308 @@ rules = [
 {"if": ["stomach_pain", "diarrhea"], "then": "food_poisoning"}
 ]
 
+class IndexedRuleEngine:
+    """Forward chaining over an index from each condition to the rules that
+    use it. Every rule keeps a count of its unmet conditions; a new fact only
+    decrements the counters of rules mentioning it, and a rule fires once,
+    when its counter reaches zero."""
+    def __init__(self, rules):
+        self.rules = rules
+        self.rules_by_condition = {}
+        self.condition_counts = []
+        self.unconditional = []
+        for i, rule in enumerate(rules):
+            conditions = set(rule["if"])
+            self.condition_counts.append(len(conditions))
+            if not conditions:
+                self.unconditional.append(i)
+            for cond in conditions:
+                self.rules_by_condition.setdefault(cond, []).append(i)
+
+    def forward_chaining(self, facts):
+        inferred = set(facts)
+        missing = self.condition_counts[:]
+        agenda = deque(inferred)
+
+        for i in self.unconditional:
+            conclusion = self.rules[i]["then"]
+            if conclusion not in inferred:
+                inferred.add(conclusion)
+                agenda.append(conclusion)
+
+        while agenda:
+            fact = agenda.popleft()
+            for i in self.rules_by_condition.get(fact, ()):
+                missing[i] -= 1
+                if missing[i] == 0:
+                    conclusion = self.rules[i]["then"]
+                    if conclusion not in inferred:
+                        inferred.add(conclusion)
+                        agenda.append(conclusion)
+        return inferred
+
+
+class TabledBackwardChainer:
+    """Goal-directed proving with rules indexed by their `then` goal.
+
+    A query first walks backwards from the goal to collect every open
+    subgoal and the rules concluding them (each visited once, so cycles like
+    A -> B, B -> A just end the walk), then fires only those rules forwards
+    with unmet-condition counters. Proven goals (with the rule that proved
+    them) and failed goals are tabled per fact set and reused by later
+    queries on the same facts. Only the `max_tables` most recently queried
+    fact sets keep their tables.
+    """
+    max_tables = 1024
+
+    def __init__(self, rules, max_tables=None):
+        self.rules = rules
+        self.rules_by_goal = {}
+        for i, rule in enumerate(rules):
+            self.rules_by_goal.setdefault(rule["then"], []).append(i)
+        if max_tables is not None:
+            self.max_tables = max_tables
+        self.tables = OrderedDict()   # frozenset(facts) -> (proven {goal: rule index}, failed set)
+
+    def prove(self, goal, facts):
+        """Proof tree for `goal`, or None if it cannot be inferred."""
+        facts = frozenset(facts)
+        tables = self.tables
+        if facts in tables:
+            tables.move_to_end(facts)
+            proven, failed = tables[facts]
+        else:
+            proven, failed = tables[facts] = ({}, set())
+            if len(tables) > self.max_tables:
+                tables.popitem(last=False)
+        if goal not in facts and goal not in proven and goal not in failed:
+            self._solve(goal, facts, proven, failed)
+        if goal in facts or goal in proven:
+            return self._proof_tree(goal, facts, proven)
+        return None
+
+    def _solve(self, goal, facts, proven, failed):
+        rules = self.rules
+        touched = {goal}
+        stack = [goal]
+        rule_ids = []
+        while stack:
+            for i in self.rules_by_goal.get(stack.pop(), ()):
+                rule_ids.append(i)
+                for cond in rules[i]["if"]:
+                    if cond not in touched and cond not in facts and cond not in proven and cond not in failed:
+                        touched.add(cond)
+                        stack.append(cond)
+
+        missing = {}
+        waiting = {}
+        agenda = []
+        for i in rule_ids:
+            open_conds = {c for c in rules[i]["if"] if c not in facts and c not in proven}
+            if open_conds & failed:
+                continue
+            missing[i] = len(open_conds)
+            if not open_conds:
+                agenda.append(i)
+            for cond in open_conds:
+                waiting.setdefault(cond, []).append(i)
+
+        while agenda:
+            i = agenda.pop()
+            conclusion = rules[i]["then"]
+            if conclusion in proven:
+                continue
+            proven[conclusion] = i
+            for j in waiting.get(conclusion, ()):
+                missing[j] -= 1
+                if missing[j] == 0:
+                    agenda.append(j)
+
+        failed.update(g for g in touched if g not in proven)
+
+    def _proof_tree(self, goal, facts, proven):
+        # A rule only fires once all its conditions hold, so proofs never
+        # loop; build them bottom-up without recursion to allow deep chains.
+        nodes = {}
+        stack = [goal]
+        while stack:
+            g = stack[-1]
+            if g in nodes:
+                stack.pop()
+                continue
+            if g in facts:
+                nodes[g] = {"goal": g, "fact": True}
+                stack.pop()
+                continue
+            rule = self.rules[proven[g]]
+            pending = [c for c in rule["if"] if c not in nodes]
+            if pending:
+                stack.extend(pending)
+                continue
+            nodes[g] = {"goal": g, "rule": rule, "because": [nodes[c] for c in rule["if"]]}
+            stack.pop()
+        return nodes[goal]
+
+
+def format_proof(tree, indent=0):
+    pad = "  " * indent
+    if tree.get("fact"):
+        return [f"{pad}{tree['goal']} (given)"]
+    lines = [f"{pad}{tree['goal']} <- {' & '.join(tree['rule']['if'])}"]
+    for child in tree["because"]:
+        lines.extend(format_proof(child, indent + 1))
+    return lines
+
+
+class RuleBase:
+    """A validated rule list with its indexed forward engine, its compiled
+    batch engine and tabled backward chainer; this is what gets cached on
+    disk."""
+    def __init__(self, rules):
+        validate_rules(rules)
+        self.rules = rules
+        self.engine = IndexedRuleEngine(rules)
+        self.compiled = CompiledRuleBase(rules)
+        self.chainer = TabledBackwardChainer(rules)
+
+    def diagnose(self, facts):
+        """Everything inferable from `facts`, minus the facts themselves."""
+        return self.engine.forward_chaining(facts) - set(facts)
+
+    def diagnose_batch(self, fact_sets):
+        """diagnose() for many fact sets at once, through the compiled engine."""
+        return [inferred - set(facts)
+                for facts, inferred in zip(fact_sets, self.compiled.forward_chaining_batch(fact_sets))]
+
+    def prove(self, goal, facts):
+        return self.chainer.prove(goal, facts)
+
+    def cache_state(self):
+        # Plain containers only, so the cache does not depend on whether
+        # this file was run as a script or imported as a module.
+        return {
+            "rules": self.rules,
+            "engine": vars(self.engine),
+            "compiled": vars(self.compiled),
+            "rules_by_goal": self.chainer.rules_by_goal,
+        }
+
+    @classmethod
+    def from_cache_state(cls, state):
+        self = cls.__new__(cls)
+        self.rules = state["rules"]
+        self.engine = IndexedRuleEngine.__new__(IndexedRuleEngine)
+        vars(self.engine).update(state["engine"])
+        self.compiled = CompiledRuleBase.__new__(CompiledRuleBase)
+        vars(self.compiled).update(state["compiled"])
+        self.chainer = TabledBackwardChainer.__new__(TabledBackwardChainer)
+        self.chainer.rules = self.rules
+        self.chainer.rules_by_goal = state["rules_by_goal"]
+        self.chainer.tables = OrderedDict()
+        return self
+
+
+def validate_rules(rules):
+    if not isinstance(rules, list):
+        raise ValueError("rule base must be a list of rules")
+    for i, rule in enumerate(rules):
+        if not isinstance(rule, dict) or set(rule) != {"if", "then"}:
+            raise ValueError(f"rule {i}: expected an object with exactly 'if' and 'then'")
+        if not isinstance(rule["if"], list) or not all(isinstance(c, str) and c for c in rule["if"]):
+            raise ValueError(f"rule {i}: 'if' must be a list of non-empty strings")
+        if not isinstance(rule["then"], str) or not rule["then"]:
+            raise ValueError(f"rule {i}: 'then' must be a non-empty string")
+
+
+def load_rule_base(path, cache_dir=".rule_cache"):
+    """Loads rules from a JSON or YAML file.
+
+    The compiled RuleBase is pickled under `cache_dir`, keyed by a SHA-256
+    of the file contents (and CACHE_VERSION), so later runs on an unchanged
+    file skip parsing, validation and indexing entirely.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(CACHE_VERSION.encode() + raw).hexdigest()
+    cache_path = os.path.join(cache_dir, digest + ".pickle")
+    if os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            return RuleBase.from_cache_state(pickle.load(f))
+
+    if path.endswith((".yaml", ".yml")):
+        import yaml  # only needed for YAML rule files
+        loaded = yaml.safe_load(raw)
+    else:
+        loaded = json.loads(raw)
+    rule_base = RuleBase(loaded)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(rule_base.cache_state(), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return rule_base
+
+
+default_rule_base = RuleBase(rules)
+
+
 def forward_chaining(facts):
-    inferred = set(facts)
-    changed = True
-    
-    while changed:
-        changed = False
-        for rule in rules:
-            if all(cond in inferred for cond in rule["if"]):
-                if rule["then"] not in inferred:
-                    inferred.add(rule["then"])
-                    changed = True
-    return inferred
+    return default_rule_base.engine.forward_chaining(facts)
 
 
 def backward_chaining(goal, facts):
-    if goal in facts:
-        return True
-    
-    for rule in rules:
-        if rule["then"] == goal:
-            # Check if all conditions can be proven
-            if all(backward_chaining(cond, facts) for cond in rule["if"]):
-                return True
-    return False
+    return default_rule_base.prove(goal, facts) is not None
 
 
-def expert_system():
+def diagnose(facts, rule_base=default_rule_base):
+    return rule_base.diagnose(facts)
+
+
+def prove(goal, facts, rule_base=default_rule_base):
+    return rule_base.prove(goal, facts)
+
+
+def run_batch(rule_base, lines, out, chunksize=4096):
+    """Diagnoses JSONL records like {"id": 1, "symptoms": [...], "goal": "flu"};
+    "id" and "goal" are optional. Writes one JSON result per record.
+
+    Records are read `chunksize` at a time and each chunk is diagnosed with
+    one call to the compiled batch engine; goals are proved one by one with
+    the tabled chainer.
+    """
+    records = []
+    for line in lines:
+        if line.strip():
+            records.append(json.loads(line))
+            if len(records) == chunksize:
+                _write_results(rule_base, records, out)
+                records = []
+    if records:
+        _write_results(rule_base, records, out)
+
+
+def _write_results(rule_base, records, out):
+    fact_sets = [record["symptoms"] for record in records]
+    for record, facts, diseases in zip(records, fact_sets, rule_base.diagnose_batch(fact_sets)):
+        result = {"diseases": sorted(diseases)}
+        if "id" in record:
+            result = {"id": record["id"], **result}
+        if "goal" in record:
+            proof = rule_base.prove(record["goal"], facts)
+            result["goal"] = record["goal"]
+            result["proven"] = proof is not None
+            result["proof"] = proof
+        out.write(json.dumps(result) + "\n")
+
+
+def expert_system(rule_base=default_rule_base):
     # Step 1: Get user symptoms
     user_facts = input("Enter your symptoms (comma separated): ").split(",")
     user_facts = [fact.strip() for fact in user_facts]
     
     # Step 2: Forward Chaining
-    results = forward_chaining(user_facts)
-    diseases = results - set(user_facts)  # remove symptoms, keep diseases
+    diseases = rule_base.diagnose(user_facts)  # symptoms removed, diseases kept
     
     print("\n=== Forward Chaining Result ===")
     if diseases:
@@ -51,8 +332,24 @@ def expert_system():
     query = input("\nDo you want to check for a specific disease? (yes/no): ")
     if query.lower() == "yes":
         goal = input("Enter the disease name to check: ").strip()
-        if backward_chaining(goal, set(user_facts)):
+        proof = rule_base.prove(goal, set(user_facts))
+        if proof is not None:
             print(f"✅ Yes, {goal} can be inferred from your symptoms.")
+            print("\n".join(format_proof(proof)))
         else:
             print(f"❌ No, {goal} cannot be inferred from your symptoms.")
-expert_system()
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rule-based disease diagnosis.")
+    parser.add_argument("--rules", help="JSON or YAML rule file (default: built-in rules)")
+    parser.add_argument("--cache-dir", default=".rule_cache")
+    parser.add_argument("--interactive", action="store_true",
+                        help="ask for symptoms at prompts instead of reading JSONL from stdin")
+    args = parser.parse_args()
+
+    rule_base = load_rule_base(args.rules, args.cache_dir) if args.rules else default_rule_base
+    if args.interactive:
+        expert_system(rule_base)
+    else:
+        run_batch(rule_base, sys.stdin, sys.stdout)
\ No newline at end of file
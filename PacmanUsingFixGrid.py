@@ -1,4 +1,6 @@
-from collections import deque
+import argparse
+from pacman_pathfinding import FlatGrid
+from pacman_simulation import make_renderer, print_stats, simulate
 
 # === Fixed Initial Grid (manually defined) ===
 grid = [
@@ -26,59 +28,29 @@ for y in range(height):
         elif grid[y][x] == 'P':
             pacman_position = (x, y)
 
-# === Directions: Up, Right, Down, Left ===
-directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
-
-
-def print_grid():
-    for row in grid:
-        print(' '.join(row))
-    print()
-
-
-def bfs(start):
-    visited = set()
-    queue = deque([(start, [])])
-
-    while queue:
-        (x, y), path = queue.popleft()
-        if (x, y) in visited:
-            continue
-        visited.add((x, y))
-
-        # Found food
-        if (x, y) in food_positions:
-            return path + [(x, y)]
-
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] != '#':
-                queue.append(((nx, ny), path + [(x, y)]))
-    return None
+# === Flat wall buffer for path planning (walls never change) ===
+pathfinder = FlatGrid(grid)
 
 
 # === Main Loop ===
-print("Initial Grid:")
-print_grid()
-
-step = 0
-while food_positions:
-    path = bfs(pacman_position) # type: ignore
-    if not path:
-        print("No path to remaining food!")
-        break
-
-    for next_pos in path[1:]:
-        grid[pacman_position[1]][pacman_position[0]] = ' ' # type: ignore
-        pacman_position = next_pos
-
-        if pacman_position in food_positions:
-            food_positions.remove(pacman_position)
-
-        grid[pacman_position[1]][pacman_position[0]] = 'P'
-
-        print(f"Step: {step}")
-        print_grid()
-        step += 1
+parser = argparse.ArgumentParser(description="Pac-Man route planning demo.")
+parser.add_argument("--headless", action="store_true",
+                    help="run without drawing and print only run statistics")
+parser.add_argument("--render", choices=["full", "diff", "buffered"], default="full",
+                    help="full grid per step, changed cells only, or one frame every --every steps")
+parser.add_argument("--every", type=int, default=100)
+parser.add_argument("--planner", choices=["tour", "field", "jps", "hpa"], default="tour",
+                    help="plan one route up front, follow a nearest-food distance field, "
+                         "or search to each pellet with jump points or a cluster graph")
+args = parser.parse_args()
+
+renderer = None if args.headless else make_renderer(args.render, args.every)
+stats = simulate(grid, pathfinder, pacman_position, food_positions, renderer,
+                 args.planner) # type: ignore
+
+if food_positions:
+    print("No path to remaining food!")
 
 print("All food are finished!")
+if args.headless:
+    print_stats(stats)
@@ -1,5 +1,18 @@
-from collections import deque
-import random
+import argparse
+from pacman_maps import generate_map
+from pacman_simulation import make_renderer, print_stats, simulate
+
+parser = argparse.ArgumentParser(description="Pac-Man route planning demo.")
+parser.add_argument("--headless", action="store_true",
+                    help="run without drawing and print only run statistics")
+parser.add_argument("--render", choices=["full", "diff", "buffered"], default="full",
+                    help="full grid per step, changed cells only, or one frame every --every steps")
+parser.add_argument("--every", type=int, default=100)
+parser.add_argument("--planner", choices=["tour", "field", "jps", "hpa"], default="tour",
+                    help="plan one route up front, follow a nearest-food distance field, "
+                         "or search to each pellet with jump points or a cluster graph")
+parser.add_argument("--seed", type=int, default=None, help="seed for the random map")
+args = parser.parse_args()
 
 # Grid parameters
 width = 10
@@ -7,90 +20,19 @@ height = 10
 num_food = 5
 wall_percentage = 0.20
 
-# Initialize gridd
-grid = [[' ' for _ in range(width)] for _ in range(height)]
-
-# Random walls
-num_walls = int(height * width * wall_percentage)
-wall_positions = set()
-while len(wall_positions) < num_walls:
-    x, y = random.randint(0, width - 1), random.randint(0, height - 1)
-    if (x, y) != (0, 0):
-        wall_positions.add((x, y))
-for x, y in wall_positions:
-    grid[y][x] = '#'
-
-# Random food
-food_positions = set()
-while len(food_positions) < num_food:
-    x, y = random.randint(0, width - 1), random.randint(0, height - 1)
-    if (x, y) != (0, 0) and (x, y) not in wall_positions:
-        food_positions.add((x, y))
-
-for x, y in food_positions:
-    grid[y][x] = 'F'
-
-# Pacman start
-pacman_position = (0, 0)
-grid[pacman_position[1]][pacman_position[0]] = 'P'
-
-directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]  # Up, Right, Down, Left
-
-
-def print_grid():
-    for row in grid:
-        print(' '.join(row))
-    print()
-
-
-def bfs(start):
-    visited = set()
-    queue = deque([(start, [])])
-
-    while queue:
-        (x, y), path = queue.popleft()
-
-        if (x, y) in visited:
-            continue
-        visited.add((x, y))
-
-        # Found food
-        if (x, y) in food_positions:
-            return path + [(x, y)]
-
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] != '#':
-                queue.append(((nx, ny), path + [(x, y)]))
-
-    return None
+# Random walls and food; food is only placed where Pac-Man can reach it
+grid, pacman_position, food_positions, pathfinder = generate_map(
+    width, height, num_food, wall_percentage, args.seed)
 
 
 # --- Game loop ---
-print("Initial Grid:")
-print_grid()
-
-step = 0
-while food_positions:
-    path = bfs(pacman_position)
-    if not path:
-        print("No path to remaining food!")
-        break
-
-    # Move step by step toward food
-    for next_pos in path[1:]:
-        # Clear previous
-        grid[pacman_position[1]][pacman_position[0]] = ' '
-        pacman_position = next_pos
-
-        # Eat food if found
-        if pacman_position in food_positions:
-            food_positions.remove(pacman_position)
-
-        grid[pacman_position[1]][pacman_position[0]] = 'P'
+renderer = None if args.headless else make_renderer(args.render, args.every)
+stats = simulate(grid, pathfinder, pacman_position, food_positions, renderer,
+                 args.planner)
 
-        print(f"Step: {step}")
-        print_grid()
-        step += 1
+if food_positions:
+    print("No path to remaining food!")
 
 print("All food are finished!")
+if args.headless:
+    print_stats(stats)
@@ -1,46 +1,90 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+import argparse
+import functools
 
+from spam_data import load_messages
+from spam_model import load_or_train, train_streaming
 
-data = pd.read_csv("spam_mail.csv", encoding="latin-1")
-data = data[['Category', 'Messages']]
-data.columns = ['label', 'message']
-data['label'] = data['label'].map({'ham': 0, 'spam': 1})
-print(" Label Conversion Preview:")
-print(data['label'].head())
-X = data['message']     
-y = data['label']      
+DATA_PATH = "spam_mail.csv"
+ARTIFACT_PATH = "spam_model_multi.npz"
+STREAM_ARTIFACT_PATH = "spam_model_multi_stream.npz"
+HYPERPARAMS = {"test_size": 0.3, "random_state": 42, "alpha": 1.0}
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.3, random_state=42
-)
 
-vectorizer = CountVectorizer()
+def train(data_path, test_size, random_state, alpha):
+    # Only imported when the artifact is missing or stale.
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.naive_bayes import MultinomialNB
 
-X_train_features = vectorizer.fit_transform(X_train)
+    data = load_messages(data_path)
+    X = data.messages()
+    y = pd.Series(data.labels, name='label')
+    print(" Label Conversion Preview:")
+    print(y.head())
 
-X_test_features = vectorizer.transform(X_test)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state
+    )
 
-model = MultinomialNB()       
-model.fit(X_train_features, y_train)  
+    vectorizer = CountVectorizer()
 
-y_pred = model.predict(X_test_features)
+    X_train_features = vectorizer.fit_transform(X_train)
 
-accuracy = accuracy_score(y_test, y_pred) * 100
-print(f"\n Model Accuracy: {accuracy:.2f}%")
+    X_test_features = vectorizer.transform(X_test)
 
-print("\n Classification Report:\n", classification_report(y_test, y_pred))
+    model = MultinomialNB(alpha=alpha)
+    model.fit(X_train_features, y_train)
 
-cm = confusion_matrix(y_test, y_pred)
-cm_df = pd.DataFrame(
-    cm,
-    index=["Actual Ham", "Actual Spam"],
-    columns=["Predicted Ham", "Predicted Spam"]
-)
-print("\n Confusion Matrix:\n", cm_df)
+    y_pred = model.predict(X_test_features)
+    return vectorizer, model, {"accuracy": report(y_test, y_pred)}
+
+
+def train_stream(data_path, chunksize, **hyperparams):
+    vectorizer, model, y_test, y_pred = train_streaming(data_path, chunksize=chunksize, **hyperparams)
+    return vectorizer, model, {"accuracy": report(y_test, y_pred)}
+
+
+def report(y_test, y_pred):
+    import pandas as pd
+    from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+    accuracy = accuracy_score(y_test, y_pred) * 100
+    print(f"\n Model Accuracy: {accuracy:.2f}%")
+
+    print("\n Classification Report:\n", classification_report(y_test, y_pred))
+
+    cm = confusion_matrix(y_test, y_pred)
+    cm_df = pd.DataFrame(
+        cm,
+        index=["Actual Ham", "Actual Spam"],
+        columns=["Predicted Ham", "Predicted Spam"]
+    )
+    print("\n Confusion Matrix:\n", cm_df)
+    return float(accuracy)
+
+
+parser = argparse.ArgumentParser(description="Train or load the spam model, then score typed messages.")
+parser.add_argument("--data", default=DATA_PATH)
+parser.add_argument("--stream", action="store_true",
+                    help="train out of core with hashed features, reading the data in chunks")
+parser.add_argument("--chunksize", type=int, default=100000)
+# alpha smoothing is spread over every hashed column, so a table much wider
+# than the vocabulary costs accuracy on a small corpus; raise it for big ones.
+parser.add_argument("--n-features", type=int, default=2 ** 14)
+args = parser.parse_args()
+
+if args.stream:
+    artifact_path = STREAM_ARTIFACT_PATH
+    hyperparams = dict(HYPERPARAMS, n_features=args.n_features)
+    model, retrained = load_or_train(args.data, artifact_path, hyperparams,
+                                     functools.partial(train_stream, chunksize=args.chunksize))
+else:
+    artifact_path = ARTIFACT_PATH
+    model, retrained = load_or_train(args.data, artifact_path, HYPERPARAMS, train)
+if not retrained:
+    print(f" Loaded {artifact_path} (accuracy {model.metadata['accuracy']:.2f}%, "
+          f"data {model.metadata['data']['sha256'][:12]})")
 
 print("\n --- Test Your Own Messages (press Enter on blank line to finish) ---")
 
@@ -53,15 +97,11 @@ while True:
 
 if not messages:
     print(" No messages entered. Exiting manual test.")
-else:  
-    features = vectorizer.transform(messages)
-  
-    preds = model.predict(features)
-    probs = model.predict_proba(features)
- 
+else:
     print("\n================ RESULTS ================\n")
-    for i, (m, p, pr) in enumerate(zip(messages, preds, probs), 1):
+    for i, m in enumerate(messages, 1):
+        p, spam = model.score(m)
         print(f"Message {i}: {m}")
         print(f"Prediction: {' SPAM' if p == 1 else ' HAM'}")
-        print(f"Confidence -> Ham: {pr[0]:.4f}, Spam: {pr[1]:.4f}")
+        print(f"Confidence -> Ham: {1 - spam:.4f}, Spam: {spam:.4f}")
         print("-" * 40)
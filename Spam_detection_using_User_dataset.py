@@ -1,61 +1,114 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.feature_extraction.text import CountVectorizer
-
-
-data = pd.read_csv('spam_mail.csv')               
-data = data[['Category', 'Messages']]             
-
-
-data['Category'] = data['Category'].map({'ham': 0, 'spam': 1})
-
-x_train, x_test, y_train, y_test = train_test_split(
-    data['Messages'], data['Category'], 
-    test_size=0.3, random_state=40
-)
-
-vectorizer = CountVectorizer()
-x_train = vectorizer.fit_transform(x_train)
-x_test = vectorizer.transform(x_test)
-
-model = MultinomialNB()
-model.fit(x_train, y_train)
-
-y_pred = model.predict(x_test)
-
-print("\n=== MODEL PERFORMANCE ===")
-print(" Accuracy Score:", accuracy_score(y_test, y_pred))
-print("\nConfusion Matrix:\n", confusion_matrix(y_test, y_pred))
-print("\nClassification Report:\n", classification_report(y_test, y_pred))
+import argparse
+import functools
+
+from spam_data import load_messages
+from spam_model import load_or_train, record_feedback, replay_feedback, train_streaming
+
+DATA_PATH = 'spam_mail.csv'
+ARTIFACT_PATH = 'spam_model_user.npz'
+STREAM_ARTIFACT_PATH = 'spam_model_user_stream.npz'
+# Labelled custom messages, replayed onto the trained model at every start.
+FEEDBACK_PATH = 'spam_feedback.jsonl'
+HYPERPARAMS = {'test_size': 0.3, 'random_state': 40, 'alpha': 1.0}
+
+
+def train(data_path, test_size, random_state, alpha):
+    # Only imported when the artifact is missing or stale.
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    data = load_messages(data_path)
+
+    x_train, x_test, y_train, y_test = train_test_split(
+        data.messages(), np.asarray(data.labels),
+        test_size=test_size, random_state=random_state
+    )
+
+    vectorizer = CountVectorizer()
+    x_train = vectorizer.fit_transform(x_train)
+    x_test = vectorizer.transform(x_test)
+
+    model = MultinomialNB(alpha=alpha)
+    model.fit(x_train, y_train)
+
+    y_pred = model.predict(x_test)
+    return vectorizer, model, {'accuracy': report(y_test, y_pred)}
+
+
+def train_stream(data_path, chunksize, **hyperparams):
+    vectorizer, model, y_test, y_pred = train_streaming(data_path, chunksize=chunksize, **hyperparams)
+    return vectorizer, model, {'accuracy': report(y_test, y_pred)}
+
+
+def report(y_test, y_pred):
+    from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+    accuracy = accuracy_score(y_test, y_pred)
+    print("\n=== MODEL PERFORMANCE ===")
+    print(" Accuracy Score:", accuracy)
+    print("\nConfusion Matrix:\n", confusion_matrix(y_test, y_pred))
+    print("\nClassification Report:\n", classification_report(y_test, y_pred))
+    return float(accuracy)
+
+
+parser = argparse.ArgumentParser(description="Train or load the spam model, then test it on typed messages.")
+parser.add_argument('--data', default=DATA_PATH)
+parser.add_argument('--stream', action='store_true',
+                    help="train out of core with hashed features, reading the data in chunks")
+parser.add_argument('--chunksize', type=int, default=100000)
+# alpha smoothing is spread over every hashed column, so a table much wider
+# than the vocabulary costs accuracy on a small corpus; raise it for big ones.
+parser.add_argument('--n-features', type=int, default=2 ** 14)
+parser.add_argument('--feedback', default=FEEDBACK_PATH, help="log of user-labelled messages to learn from")
+args = parser.parse_args()
+
+if args.stream:
+    artifact_path = STREAM_ARTIFACT_PATH
+    hyperparams = dict(HYPERPARAMS, n_features=args.n_features)
+    model, retrained = load_or_train(args.data, artifact_path, hyperparams,
+                                     functools.partial(train_stream, chunksize=args.chunksize))
+else:
+    artifact_path = ARTIFACT_PATH
+    model, retrained = load_or_train(args.data, artifact_path, HYPERPARAMS, train)
+if not retrained:
+    print(f"Loaded {artifact_path} (accuracy {model.metadata['accuracy']:.4f}, "
+          f"data {model.metadata['data']['sha256'][:12]})")
+replayed = replay_feedback(model, args.feedback)
+if replayed:
+    print(f"Replayed {replayed} labelled messages from {args.feedback}")
 
 
 print("\n=== TEST WITH YOUR OWN MESSAGE ===")
 msg = input("Enter a message: ")
 
-msg_vectorized = vectorizer.transform([msg])  
-pred = model.predict(msg_vectorized)[0]       
+pred, _ = model.score(msg)
 
 print("Prediction:", "Spam" if pred == 1 else "💬 Ham")
 
 print("\n=== TEST WITH 5 CUSTOM MESSAGES ===")
-custom_data = []
+custom_messages = []
+custom_labels = []
 
 for i in range(5):
     message = input(f"\nEnter message {i+1}: ")
-    category = input("Enter category (ham/spam): ")
-    custom_data.append({'Messages': message, 'Category': category})
-custom_df = pd.DataFrame(custom_data)
+    category = input("Enter category (ham/spam): ").strip().lower()
+    while category not in ('ham', 'spam'):
+        category = input("Please enter ham or spam: ").strip().lower()
+    custom_messages.append(message)
+    custom_labels.append({'ham': 0, 'spam': 1}[category])
 
-X_custom = vectorizer.transform(custom_df['Messages'])
-y_custom = custom_df['Category'].map({'ham': 0, 'spam': 1})
-
-y_pred_custom = model.predict(X_custom)
+y_pred_custom = model.predict(custom_messages)
 
+# Metrics only matter once labelled data has been typed in.
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
 print("\n=== RESULTS ON CUSTOM DATA ===")
 print("Predicted labels:", y_pred_custom)
-print("\n Accuracy Score:", accuracy_score(y_custom, y_pred_custom))
-print("\nClassification Report:\n", classification_report(y_custom, y_pred_custom))
-print("\nConfusion Matrix:\n", confusion_matrix(y_custom, y_pred_custom))
+print("\n Accuracy Score:", accuracy_score(custom_labels, y_pred_custom))
+print("\nClassification Report:\n", classification_report(custom_labels, y_pred_custom))
+print("\nConfusion Matrix:\n", confusion_matrix(custom_labels, y_pred_custom))
+
+added = record_feedback(model, args.feedback, custom_messages, custom_labels)
+print(f"\nLearned from {len(custom_messages)} labelled messages ({added} new tokens), logged to {args.feedback}")
@@ -0,0 +1,110 @@
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+from pacman_pathfinding import FlatGrid
+from pacman_simulation import simulate
+
+
+def generate_map(width, height, num_food, wall_percentage, seed=None, max_tries=100):
+    """Random walls and food with every pellet reachable from Pac-Man at (0, 0).
+
+    Walls are drawn in one vectorized sample; a flood fill from Pac-Man then
+    marks the open cells it can reach and food is sampled only from those.
+    Layouts whose reachable area cannot hold `num_food` pellets are redrawn.
+    Returns (grid, pacman_position, food_positions, pathfinder).
+    """
+    rng = np.random.default_rng(seed)
+    cells = width * height
+    num_walls = int(cells * wall_percentage)
+
+    for _ in range(max_tries):
+        walls = np.zeros(cells, dtype=np.uint8)
+        # Cell 0 is Pac-Man's start and is never a wall.
+        walls[rng.choice(np.arange(1, cells), num_walls, replace=False)] = 1
+        walls = walls.reshape(height, width)
+
+        pathfinder = FlatGrid.from_walls(walls)
+        field = np.frombuffer(pathfinder.distance_field((0, 0)), dtype='l')
+        reachable = field.reshape(height + 2, width + 2)[1:-1, 1:-1] > 0
+        reachable_cells = np.flatnonzero(reachable)
+        if len(reachable_cells) >= num_food:
+            break
+    else:
+        raise ValueError(f"no {width}x{height} layout with {num_food} reachable "
+                         f"pellets after {max_tries} tries")
+
+    food = rng.choice(reachable_cells, num_food, replace=False)
+
+    chars = np.where(walls == 1, '#', ' ')
+    chars.flat[food] = 'F'
+    chars[0, 0] = 'P'
+    grid = chars.tolist()
+    food_positions = {(int(i % width), int(i // width)) for i in food}
+    return grid, (0, 0), food_positions, pathfinder
+
+
+def run_seed(seed, width, height, num_food, wall_percentage, planner='tour'):
+    """Generates one seeded map and simulates it headless."""
+    grid, pacman_position, food_positions, pathfinder = generate_map(
+        width, height, num_food, wall_percentage, seed)
+    stats = simulate(grid, pathfinder, pacman_position, food_positions, planner=planner)
+    stats["seed"] = seed
+    return stats
+
+
+def _run_seed_args(args):
+    return run_seed(*args)
+
+
+def run_batch(num_maps, width, height, num_food, wall_percentage, seed=0, processes=None,
+              planner='tour'):
+    """Simulates `num_maps` maps seeded seed, seed + 1, ... across a Pool."""
+    jobs = [(seed + i, width, height, num_food, wall_percentage, planner)
+            for i in range(num_maps)]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(_run_seed_args, jobs, chunksize=max(1, num_maps // 64))
+
+
+def summarize(results):
+    steps = np.array([r["steps"] for r in results])
+    planning = np.array([r["planning_time"] for r in results])
+    movement = np.array([r["movement_time"] for r in results])
+    return {
+        "maps": len(results),
+        "food_eaten": int(sum(r["food_eaten"] for r in results)),
+        "steps_mean": float(steps.mean()),
+        "steps_median": float(np.median(steps)),
+        "steps_p95": float(np.percentile(steps, 95)),
+        "planning_time_mean": float(planning.mean()),
+        "planning_time_total": float(planning.sum()),
+        "movement_time_total": float(movement.sum()),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Pac-Man planners on random maps.")
+    parser.add_argument("--maps", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--height", type=int, default=10)
+    parser.add_argument("--food", type=int, default=5)
+    parser.add_argument("--walls", type=float, default=0.20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--planner", choices=["tour", "field", "jps", "hpa"], default="tour")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run_batch(args.maps, args.width, args.height, args.food, args.walls,
+                        args.seed, args.processes, args.planner)
+    summary = summarize(results)
+
+    print(f"Maps simulated: {summary['maps']} in {time.perf_counter() - started:.2f} s")
+    print(f"Food eaten: {summary['food_eaten']}")
+    print(f"Steps: mean {summary['steps_mean']:.1f}, median {summary['steps_median']:.1f}, "
+          f"p95 {summary['steps_p95']:.1f}")
+    print(f"Planning time: mean {summary['planning_time_mean'] * 1000:.3f} ms, "
+          f"total {summary['planning_time_total']:.2f} s")
+    print(f"Movement time: total {summary['movement_time_total']:.2f} s")
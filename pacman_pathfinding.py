@@ -0,0 +1,633 @@
+from array import array
+import heapq
+
+# Internally the grid is padded with a one-cell wall border, so neighbours of
+# a flat index are just index +/- 1 and index +/- stride, with no bounds checks.
+
+
+class FlatGrid:
+    def __init__(self, grid):
+        width = len(grid[0])
+        height = len(grid)
+        stride = width + 2
+        walls = bytearray(b"\x01") * (stride * (height + 2))
+        for y, row in enumerate(grid):
+            base = (y + 1) * stride + 1
+            for x, cell in enumerate(row):
+                if cell != '#':
+                    walls[base + x] = 0
+        self._setup(width, height, walls)
+
+    @classmethod
+    def from_walls(cls, walls):
+        """Builds the planner from a 2-D uint8 NumPy array (1 = wall),
+        copying whole rows into the padded buffer."""
+        height, width = walls.shape
+        stride = width + 2
+        buffer = bytearray(b"\x01") * (stride * (height + 2))
+        for y in range(height):
+            base = (y + 1) * stride + 1
+            buffer[base:base + width] = walls[y].tobytes()
+        self = cls.__new__(cls)
+        self._setup(width, height, buffer)
+        return self
+
+    def _setup(self, width, height, walls):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.walls = walls
+        size = len(walls)
+
+        # Up, Right, Down, Left.
+        self.offsets = (-self.stride, 1, self.stride, -1)
+        # Preallocated per-search buffers; only touched cells are reset.
+        self.parent = array('l', [-1]) * size
+        self.targets = bytearray(size)
+
+    def index(self, pos):
+        x, y = pos
+        return (y + 1) * self.stride + x + 1
+
+    def position(self, index):
+        y, x = divmod(index, self.stride)
+        return (x - 1, y - 1)
+
+    def is_wall(self, pos):
+        return self.walls[self.index(pos)] == 1
+
+    def set_wall(self, pos, wall=True):
+        self.walls[self.index(pos)] = 1 if wall else 0
+
+    def path_to(self, index):
+        """Rebuilds the (x, y) path from the last search's root to `index`."""
+        parent = self.parent
+        path = []
+        while index >= 0:
+            path.append(self.position(index))
+            index = parent[index]
+        path.reverse()
+        return path
+
+    def bfs(self, start, targets):
+        """Shortest path from `start` to the nearest position in `targets`.
+
+        Returns the list of (x, y) cells including both ends, or None if no
+        target is reachable. Cells are marked on push, so each one enters the
+        queue once, and the path is rebuilt from parent links only at the end.
+        """
+        walls, parent, offsets, marks = self.walls, self.parent, self.offsets, self.targets
+        target_cells = [self.index(pos) for pos in targets]
+        for cell in target_cells:
+            marks[cell] = 1
+
+        root = self.index(start)
+        # The queue doubles as the list of touched cells to reset afterwards.
+        queue = [root]
+        parent[root] = -2   # visited, and the root of the path
+        head = 0
+        found = -1
+        while head < len(queue):
+            cell = queue[head]
+            head += 1
+            if marks[cell]:
+                found = cell
+                break
+            for offset in offsets:
+                nxt = cell + offset
+                if parent[nxt] == -1 and not walls[nxt]:
+                    parent[nxt] = cell
+                    queue.append(nxt)
+
+        parent[root] = -1
+        path = self.path_to(found) if found >= 0 else None
+        for cell in queue:
+            parent[cell] = -1
+        for cell in target_cells:
+            marks[cell] = 0
+        return path
+
+    def distance_field(self, source):
+        """BFS step counts from `source` to every cell (-1 where unreachable)."""
+        walls, offsets = self.walls, self.offsets
+        dist = array('l', [-1]) * len(walls)
+        root = self.index(source)
+        dist[root] = 0
+        queue = [root]
+        head = 0
+        while head < len(queue):
+            cell = queue[head]
+            head += 1
+            d = dist[cell] + 1
+            for offset in offsets:
+                nxt = cell + offset
+                if dist[nxt] == -1 and not walls[nxt]:
+                    dist[nxt] = d
+                    queue.append(nxt)
+        return dist
+
+    def descend(self, start, field):
+        """Walks from `start` down `field` to its zero cell; one step per move."""
+        offsets = self.offsets
+        cell = self.index(start)
+        path = [start]
+        while field[cell] > 0:
+            want = field[cell] - 1
+            for offset in offsets:
+                if field[cell + offset] == want:
+                    cell += offset
+                    break
+            path.append(self.position(cell))
+        return path
+
+    def plan_tour(self, start, food_positions, exact_limit=12):
+        """Visits every reachable pellet along a short overall route.
+
+        One BFS per pellet gives both the all-pairs distance matrix and, by
+        symmetry, the distances from `start`. The visiting order comes from
+        Held-Karp when there are at most `exact_limit` pellets and from
+        nearest insertion plus 2-opt otherwise; each leg is then walked down
+        the destination pellet's distance field. Returns the (x, y) path
+        starting at `start`; unreachable pellets are left out.
+        """
+        start_cell = self.index(start)
+        foods = []
+        fields = []
+        for pos in food_positions:
+            field = self.distance_field(pos)
+            if field[start_cell] >= 0:
+                foods.append(pos)
+                fields.append(field)
+
+        # Node 0 is Pac-Man, node i + 1 is foods[i].
+        cells = [start_cell] + [self.index(pos) for pos in foods]
+        dist = [[0] * len(cells) for _ in cells]
+        for i, field in enumerate(fields):
+            for j, cell in enumerate(cells):
+                dist[i + 1][j] = dist[j][i + 1] = field[cell]
+
+        if len(foods) <= exact_limit:
+            order = held_karp(dist)
+        else:
+            order = two_opt(dist, nearest_insertion(dist))
+
+        path = [start]
+        for node in order[1:]:
+            path.extend(self.descend(path[-1], fields[node - 1])[1:])
+        return path
+
+
+class FoodDistanceField:
+    """Distance from every cell to its nearest pellet, kept up to date as
+    pellets are eaten.
+
+    One multi-source BFS from all pellets fills `dist` and records in `owner`
+    which pellet claimed each cell. Every cell's BFS path to its owner runs
+    through cells with the same owner, so removing a pellet only invalidates
+    the cells it owned; those are re-filled from their still-valid border.
+    Agents on the same map can share one field and call next_step() freely.
+    """
+    def __init__(self, pathfinder, food_positions):
+        self.pathfinder = pathfinder
+        size = len(pathfinder.walls)
+        self.dist = array('l', [-1]) * size
+        self.owner = array('l', [-1]) * size
+        self.food = set()
+
+        dist, owner, walls, offsets = self.dist, self.owner, pathfinder.walls, pathfinder.offsets
+        queue = []
+        for pos in food_positions:
+            cell = pathfinder.index(pos)
+            self.food.add(cell)
+            dist[cell] = 0
+            owner[cell] = cell
+            queue.append(cell)
+        head = 0
+        while head < len(queue):
+            cell = queue[head]
+            head += 1
+            d = dist[cell] + 1
+            for offset in offsets:
+                nxt = cell + offset
+                if dist[nxt] == -1 and not walls[nxt]:
+                    dist[nxt] = d
+                    owner[nxt] = owner[cell]
+                    queue.append(nxt)
+
+    def is_food(self, pos):
+        return self.pathfinder.index(pos) in self.food
+
+    def distance(self, pos):
+        """Steps to the nearest pellet, or -1 if none is reachable."""
+        return self.dist[self.pathfinder.index(pos)]
+
+    def next_step(self, pos):
+        """Neighbour one step closer to the nearest pellet, or None when
+        `pos` is on a pellet or no pellet is reachable."""
+        dist, offsets = self.dist, self.pathfinder.offsets
+        cell = self.pathfinder.index(pos)
+        want = dist[cell] - 1
+        if want < 0:
+            return None
+        for offset in offsets:
+            if dist[cell + offset] == want:
+                return self.pathfinder.position(cell + offset)
+
+    def remove_food(self, pos):
+        """Drops a pellet and repairs only the region it was nearest to."""
+        source = self.pathfinder.index(pos)
+        if source not in self.food:
+            return
+        self.food.discard(source)
+        dist, owner = self.dist, self.owner
+        walls, offsets = self.pathfinder.walls, self.pathfinder.offsets
+
+        region = [source]
+        dist[source] = -1
+        owner[source] = -1
+        head = 0
+        while head < len(region):
+            cell = region[head]
+            head += 1
+            for offset in offsets:
+                nxt = cell + offset
+                if owner[nxt] == source:
+                    dist[nxt] = -1
+                    owner[nxt] = -1
+                    region.append(nxt)
+
+        # Seed the region from neighbouring cells owned by surviving pellets.
+        heap = []
+        for cell in region:
+            for offset in offsets:
+                nxt = cell + offset
+                if dist[nxt] >= 0:
+                    heap.append((dist[nxt] + 1, cell, owner[nxt]))
+        heapq.heapify(heap)
+        while heap:
+            d, cell, claimed_by = heapq.heappop(heap)
+            if dist[cell] != -1:
+                continue
+            dist[cell] = d
+            owner[cell] = claimed_by
+            for offset in offsets:
+                nxt = cell + offset
+                if dist[nxt] == -1 and not walls[nxt]:
+                    heapq.heappush(heap, (d + 1, nxt, claimed_by))
+
+
+def held_karp(dist):
+    """Exact shortest open path from node 0 through every node (O(2^n n^2))."""
+    n = len(dist) - 1
+    if n == 0:
+        return [0]
+    full = 1 << n
+    inf = float("inf")
+    # cost[mask][j]: shortest path from 0 over `mask`, ending at node j + 1.
+    cost = [[inf] * n for _ in range(full)]
+    prev = [[-1] * n for _ in range(full)]
+    for j in range(n):
+        cost[1 << j][j] = dist[0][j + 1]
+    for mask in range(1, full):
+        row = cost[mask]
+        for j in range(n):
+            base = row[j]
+            if base == inf or not mask >> j & 1:
+                continue
+            for k in range(n):
+                if mask >> k & 1:
+                    continue
+                nxt = mask | 1 << k
+                c = base + dist[j + 1][k + 1]
+                if c < cost[nxt][k]:
+                    cost[nxt][k] = c
+                    prev[nxt][k] = j
+    mask = full - 1
+    j = min(range(n), key=lambda k: cost[mask][k])
+    order = []
+    while j >= 0:
+        order.append(j + 1)
+        mask, j = mask & ~(1 << j), prev[mask][j]
+    order.append(0)
+    order.reverse()
+    return order
+
+
+def nearest_insertion(dist):
+    """Open path from node 0: repeatedly insert the node closest to the
+    current route at the position that lengthens it least."""
+    n = len(dist)
+    order = [0]
+    remaining = set(range(1, n))
+    # closest[v]: distance from v to the nearest node already on the route.
+    closest = {v: dist[0][v] for v in remaining}
+    while remaining:
+        v = min(remaining, key=closest.__getitem__)
+        remaining.remove(v)
+        best_at, best_cost = len(order), dist[order[-1]][v]   # append at the end
+        for i in range(len(order) - 1):
+            a, b = order[i], order[i + 1]
+            added = dist[a][v] + dist[v][b] - dist[a][b]
+            if added < best_cost:
+                best_at, best_cost = i + 1, added
+        order.insert(best_at, v)
+        for u in remaining:
+            if dist[v][u] < closest[u]:
+                closest[u] = dist[v][u]
+    return order
+
+
+def two_opt(dist, order):
+    """Reverses route segments while that shortens the open path; node 0 stays first."""
+    order = order[:]
+    n = len(order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            for k in range(i + 1, n):
+                a, b = order[i - 1], order[i]
+                c = order[k]
+                before = dist[a][b]
+                after = dist[a][c]
+                if k + 1 < n:
+                    d = order[k + 1]
+                    before += dist[c][d]
+                    after += dist[b][d]
+                if after < before:
+                    order[i:k + 1] = reversed(order[i:k + 1])
+                    improved = True
+    return order
+
+
+def manhattan(pathfinder, a, b):
+    ay, ax = divmod(a, pathfinder.stride)
+    by, bx = divmod(b, pathfinder.stride)
+    return abs(ax - bx) + abs(ay - by)
+
+
+class JumpPointSearch:
+    """A* over jump points on a 4-connected FlatGrid.
+
+    Paths are kept canonical by taking vertical moves as early as possible:
+    a horizontal run only stops where a vertical move opens up that was
+    blocked one cell back (a forced neighbour), while a vertical run stops
+    wherever a horizontal run from it would find a jump point. Since walls
+    are static, the next jump point in every direction is precomputed per
+    cell once, so each jump during a query is a table lookup plus a check
+    for the goal's row and column.
+    """
+    def __init__(self, pathfinder):
+        self.pathfinder = pathfinder
+        walls, stride = pathfinder.walls, pathfinder.stride
+        size = len(walls)
+        cells = range(1, size - 1)
+        self.jumps = {}
+
+        # Ids of maximal open runs; equal ids mean no wall in between.
+        self.row_run = array('l', [-1]) * size
+        self.col_run = array('l', [-1]) * size
+        for cell in range(stride, size - stride):
+            if not walls[cell]:
+                self.row_run[cell] = self.row_run[cell - 1] if not walls[cell - 1] else cell
+                self.col_run[cell] = self.col_run[cell - stride] if not walls[cell - stride] else cell
+
+        # Horizontal: next cell along `step` with a newly opened vertical move.
+        for step in (1, -1):
+            jump = array('l', [-1]) * size
+            for cell in (reversed(cells) if step > 0 else cells):
+                nxt = cell + step
+                if walls[cell] or walls[nxt]:
+                    continue
+                forced = any(not walls[nxt + v] and walls[cell + v] for v in (-stride, stride))
+                jump[cell] = nxt if forced else jump[nxt]
+            self.jumps[step] = jump
+        right, left = self.jumps[1], self.jumps[-1]
+
+        # Vertical: next cell along `step` whose horizontal runs find a jump point.
+        for step in (stride, -stride):
+            jump = array('l', [-1]) * size
+            for cell in (range(size - stride - 1, stride, -1) if step > 0 else range(stride, size - stride)):
+                nxt = cell + step
+                if walls[cell] or walls[nxt]:
+                    continue
+                jump[cell] = nxt if right[nxt] >= 0 or left[nxt] >= 0 else jump[nxt]
+            self.jumps[step] = jump
+
+    def _jump(self, cell, step, goal):
+        """First stop from `cell` along `step`: a jump point, the goal, or -1."""
+        stride = self.pathfinder.stride
+        best = self.jumps[step][cell]
+        candidates = [goal]
+        if step in (-stride, stride):
+            # Stop on the goal's row if a horizontal run from there reaches it.
+            row_cell = cell + (goal // stride - cell // stride) * stride
+            if self.row_run[row_cell] == self.row_run[goal] >= 0:
+                candidates.append(row_cell)
+            runs = self.col_run
+        else:
+            runs = self.row_run
+        for stop in candidates:
+            if stop != cell and runs[stop] == runs[cell] and (stop - cell) * step > 0:
+                if best < 0 or abs(stop - cell) < abs(best - cell):
+                    best = stop
+        return best
+
+    def _directions(self, cell, arrived_by):
+        walls, stride = self.pathfinder.walls, self.pathfinder.stride
+        if arrived_by == 0:
+            return (-stride, 1, stride, -1)
+        if arrived_by in (-stride, stride):
+            return (arrived_by, 1, -1)
+        # Horizontal: keep going, plus any vertical move that is newly open.
+        return (arrived_by,) + tuple(v for v in (-stride, stride)
+                                     if not walls[cell + v] and walls[cell - arrived_by + v])
+
+    def find_path(self, start, goal):
+        """Shortest (x, y) path from `start` to `goal`, or None."""
+        pathfinder = self.pathfinder
+        source, target = pathfinder.index(start), pathfinder.index(goal)
+        g_score = {source: 0}
+        parent = {source: -1}
+        heap = [(manhattan(pathfinder, source, target), 0, source, 0)]
+        closed = set()
+
+        while heap:
+            _, g, cell, arrived_by = heapq.heappop(heap)
+            if cell in closed:
+                continue
+            closed.add(cell)
+            if cell == target:
+                return self._expand(parent, cell)
+            for step in self._directions(cell, arrived_by):
+                jump = self._jump(cell, step, target)
+                if jump < 0:
+                    continue
+                cost = g + manhattan(pathfinder, cell, jump)
+                if cost < g_score.get(jump, cost + 1):
+                    g_score[jump] = cost
+                    parent[jump] = cell
+                    heapq.heappush(heap, (cost + manhattan(pathfinder, jump, target), cost, jump, step))
+        return None
+
+    def _expand(self, parent, cell):
+        # Jump points back to the start, then fill in the straight segments.
+        points = []
+        while cell >= 0:
+            points.append(cell)
+            cell = parent[cell]
+        points.reverse()
+        stride = self.pathfinder.stride
+        path = [self.pathfinder.position(points[0])]
+        for a, b in zip(points, points[1:]):
+            step = (1 if b > a else -1) * (1 if abs(b - a) < stride else stride)
+            for cell in range(a + step, b + step, step):
+                path.append(self.pathfinder.position(cell))
+        return path
+
+
+class ClusterGraph:
+    """Hierarchical path planning over square clusters of the grid.
+
+    Built once per map: every open stretch of a cluster border gets one
+    transition (two at the ends of stretches of 6 or more), and transitions
+    inside the same cluster are linked by in-cluster BFS distances. A query
+    temporarily links start and goal into that graph, runs A* on it and then
+    refines only the chosen abstract edges with in-cluster BFS. Paths are
+    near-optimal rather than exact.
+    """
+    def __init__(self, pathfinder, cluster_size=10):
+        self.pathfinder = pathfinder
+        self.cluster_size = cluster_size
+        width, height, stride = pathfinder.width, pathfinder.height, pathfinder.stride
+        walls = pathfinder.walls
+
+        # cluster_of[cell] for open cells, -1 for walls and the border.
+        clusters_x = (width + cluster_size - 1) // cluster_size
+        self.cluster_of = array('l', [-1]) * len(walls)
+        for y in range(height):
+            for x in range(width):
+                cell = pathfinder.index((x, y))
+                if not walls[cell]:
+                    self.cluster_of[cell] = (y // cluster_size) * clusters_x + x // cluster_size
+
+        self.edges = {}   # node -> {neighbour: cost}
+        # Vertical borders between horizontally adjacent clusters, then horizontal ones.
+        for x in range(cluster_size - 1, width - 1, cluster_size):
+            for y0 in range(0, height, cluster_size):
+                cells = [pathfinder.index((x, y)) for y in range(y0, min(y0 + cluster_size, height))]
+                self._add_transitions(cells, 1)
+        for y in range(cluster_size - 1, height - 1, cluster_size):
+            for x0 in range(0, width, cluster_size):
+                cells = [pathfinder.index((x, y)) for x in range(x0, min(x0 + cluster_size, width))]
+                self._add_transitions(cells, stride)
+
+        nodes_by_cluster = {}
+        for node in self.edges:
+            nodes_by_cluster.setdefault(self.cluster_of[node], []).append(node)
+        self.nodes_by_cluster = nodes_by_cluster
+        for nodes in nodes_by_cluster.values():
+            for node in nodes:
+                dist, _ = self._cluster_bfs(node)
+                for other in nodes:
+                    if other != node and other in dist:
+                        self.edges[node][other] = dist[other]
+
+    def _add_transitions(self, cells, across):
+        walls = self.pathfinder.walls
+        run = []
+        for cell in cells + [None]:
+            if cell is not None and not walls[cell] and not walls[cell + across]:
+                run.append(cell)
+                continue
+            if run:
+                picks = [run[len(run) // 2]] if len(run) < 6 else [run[0], run[-1]]
+                for a in picks:
+                    b = a + across
+                    self.edges.setdefault(a, {})[b] = 1
+                    self.edges.setdefault(b, {})[a] = 1
+            run = []
+
+    def _cluster_bfs(self, source):
+        """BFS distances and parents from `source`, staying inside its cluster."""
+        cluster_of, offsets = self.cluster_of, self.pathfinder.offsets
+        cluster = cluster_of[source]
+        dist = {source: 0}
+        parent = {source: -1}
+        queue = [source]
+        head = 0
+        while head < len(queue):
+            cell = queue[head]
+            head += 1
+            for offset in offsets:
+                nxt = cell + offset
+                if nxt not in dist and cluster_of[nxt] == cluster:
+                    dist[nxt] = dist[cell] + 1
+                    parent[nxt] = cell
+                    queue.append(nxt)
+        return dist, parent
+
+    def _cluster_path(self, a, b):
+        _, parent = self._cluster_bfs(a)
+        cells = []
+        while b >= 0:
+            cells.append(b)
+            b = parent[b]
+        cells.reverse()
+        return cells
+
+    def find_path(self, start, goal):
+        """Near-shortest (x, y) path from `start` to `goal`, or None."""
+        pathfinder = self.pathfinder
+        source, target = pathfinder.index(start), pathfinder.index(goal)
+        if self.cluster_of[source] < 0 or self.cluster_of[target] < 0:
+            return None
+
+        source_dist, _ = self._cluster_bfs(source)
+        target_dist, _ = self._cluster_bfs(target)
+        source_links = {n: source_dist[n] for n in self.nodes_by_cluster.get(self.cluster_of[source], ())
+                        if n in source_dist}
+        target_links = {n: target_dist[n] for n in self.nodes_by_cluster.get(self.cluster_of[target], ())
+                        if n in target_dist}
+
+        best_cost = source_dist.get(target)
+        best_nodes = [source, target] if best_cost is not None else None
+
+        g_score = {source: 0}
+        parent = {source: -1}
+        heap = [(manhattan(pathfinder, source, target), 0, source)]
+        while heap:
+            f, g, node = heapq.heappop(heap)
+            if best_cost is not None and f >= best_cost:
+                break
+            if g > g_score[node]:
+                continue
+            if node == target:
+                best_cost = g
+                best_nodes = []
+                while node >= 0:
+                    best_nodes.append(node)
+                    node = parent[node]
+                best_nodes.reverse()
+                break
+            links = list(self.edges.get(node, {}).items())
+            if node == source:
+                links.extend(source_links.items())
+            if node in target_links:
+                links.append((target, target_links[node]))
+            for nxt, cost in links:
+                cost += g
+                if cost < g_score.get(nxt, cost + 1):
+                    g_score[nxt] = cost
+                    parent[nxt] = node
+                    heapq.heappush(heap, (cost + manhattan(pathfinder, nxt, target), cost, nxt))
+
+        if best_nodes is None:
+            return None
+        cells = [source]
+        for a, b in zip(best_nodes, best_nodes[1:]):
+            if self.cluster_of[a] == self.cluster_of[b]:
+                cells.extend(self._cluster_path(a, b)[1:])
+            else:
+                cells.append(b)
+        return [pathfinder.position(cell) for cell in cells]
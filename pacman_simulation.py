@@ -0,0 +1,187 @@
+import sys
+import time
+
+from pacman_pathfinding import ClusterGraph, FoodDistanceField, JumpPointSearch
+
+
+def format_grid(grid):
+    return '\n'.join(' '.join(row) for row in grid) + '\n'
+
+
+class FullRenderer:
+    """Prints the whole grid after every step."""
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+
+    def start(self, grid):
+        self.stream.write("Initial Grid:\n" + format_grid(grid) + '\n')
+
+    def step(self, step, grid, changed):
+        self.stream.write(f"Step: {step}\n" + format_grid(grid) + '\n')
+
+    def finish(self, grid):
+        self.stream.flush()
+
+
+class DiffRenderer:
+    """Draws the grid once, then rewrites only the changed cells in place
+    with ANSI cursor moves; the step counter sits on the line below."""
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+
+    def start(self, grid):
+        self.height = len(grid)
+        self.stream.write("\x1b[2J\x1b[H" + format_grid(grid))
+
+    def step(self, step, grid, changed):
+        out = [f"\x1b[{y + 1};{2 * x + 1}H{grid[y][x]}" for x, y in changed]
+        out.append(f"\x1b[{self.height + 1};1HStep: {step}\x1b[K")
+        self.stream.write(''.join(out))
+
+    def finish(self, grid):
+        self.stream.write(f"\x1b[{self.height + 2};1H")
+        self.stream.flush()
+
+
+class BufferedRenderer:
+    """Prints one full frame every `every` steps, plus the final frame."""
+    def __init__(self, every=100, stream=sys.stdout):
+        self.every = every
+        self.stream = stream
+        self.last_step = None
+
+    def start(self, grid):
+        self.stream.write("Initial Grid:\n" + format_grid(grid) + '\n')
+
+    def step(self, step, grid, changed):
+        self.last_step = step
+        if step % self.every == 0:
+            self.stream.write(f"Step: {step}\n" + format_grid(grid) + '\n')
+
+    def finish(self, grid):
+        if self.last_step is not None and self.last_step % self.every != 0:
+            self.stream.write(f"Step: {self.last_step}\n" + format_grid(grid) + '\n')
+        self.stream.flush()
+
+
+def make_renderer(name, every=100):
+    """Renderer for a --render choice: 'full', 'diff' or 'buffered'."""
+    if name == 'diff':
+        return DiffRenderer()
+    if name == 'buffered':
+        return BufferedRenderer(every)
+    return FullRenderer()
+
+
+def follow_field(field, pacman_position, stats):
+    """Yields Pac-Man's moves down a shared FoodDistanceField, eating and
+    repairing the field as it goes; time spent there counts as planning."""
+    while True:
+        started = time.perf_counter()
+        if field.is_food(pacman_position):
+            field.remove_food(pacman_position)
+        next_pos = field.next_step(pacman_position)
+        stats["planning_time"] += time.perf_counter() - started
+        if next_pos is None:
+            return
+        pacman_position = next_pos
+        yield next_pos
+
+
+def follow_searches(search, pacman_position, food_positions, stats):
+    """Yields Pac-Man's moves towards the pellet nearest by Manhattan
+    distance, one point-to-point `search.find_path` query per pellet.
+    The search object (and any per-map index it built) is reused."""
+    unreachable = set()
+    while True:
+        started = time.perf_counter()
+        path = None
+        while path is None:
+            targets = food_positions - unreachable
+            if not targets:
+                break
+            target = min(targets, key=lambda f: abs(f[0] - pacman_position[0]) + abs(f[1] - pacman_position[1]))
+            path = search.find_path(pacman_position, target)
+            if path is None:
+                unreachable.add(target)
+        stats["planning_time"] += time.perf_counter() - started
+        if path is None:
+            return
+        for next_pos in path[1:]:
+            pacman_position = next_pos
+            yield next_pos
+
+
+def simulate(grid, pathfinder, pacman_position, food_positions, renderer=None, planner='tour'):
+    """Walks Pac-Man until the food runs out and returns run statistics.
+
+    planner='tour' plans one route through every pellet up front;
+    planner='field' follows a nearest-food distance field step by step.
+    planner='jps' / 'hpa' query jump point search or the cluster graph
+    once per pellet; both index the static walls once per map.
+    `grid` and `food_positions` are updated in place as pellets are eaten.
+    With `renderer=None` the run is headless and nothing is printed.
+    """
+    stats = {
+        "steps": 0,
+        "food_eaten": 0,
+        "planning_time": 0.0,
+        "movement_time": 0.0,
+        "render_time": 0.0,
+    }
+
+    started = time.perf_counter()
+    if planner == 'field':
+        field = FoodDistanceField(pathfinder, food_positions)
+        stats["planning_time"] = time.perf_counter() - started
+        route = follow_field(field, pacman_position, stats)
+    elif planner in ('jps', 'hpa'):
+        search = JumpPointSearch(pathfinder) if planner == 'jps' else ClusterGraph(pathfinder)
+        stats["planning_time"] = time.perf_counter() - started
+        route = follow_searches(search, pacman_position, food_positions, stats)
+    else:
+        path = pathfinder.plan_tour(pacman_position, food_positions)
+        stats["planning_time"] = time.perf_counter() - started
+        route = path[1:]
+    setup_time = stats["planning_time"]
+
+    if renderer is not None:
+        renderer.start(grid)
+
+    render_time = 0.0
+    started = time.perf_counter()
+    for step, next_pos in enumerate(route):
+        grid[pacman_position[1]][pacman_position[0]] = ' '
+        changed = (pacman_position, next_pos)
+        pacman_position = next_pos
+
+        if pacman_position in food_positions:
+            food_positions.remove(pacman_position)
+            stats["food_eaten"] += 1
+
+        grid[pacman_position[1]][pacman_position[0]] = 'P'
+        stats["steps"] += 1
+
+        if renderer is not None:
+            render_started = time.perf_counter()
+            renderer.step(step, grid, changed)
+            render_time += time.perf_counter() - render_started
+
+    if renderer is not None:
+        render_started = time.perf_counter()
+        renderer.finish(grid)
+        render_time += time.perf_counter() - render_started
+
+    stats["render_time"] = render_time
+    # Planning done while walking (field and per-pellet searches) is not movement.
+    walk_planning = stats["planning_time"] - setup_time
+    stats["movement_time"] = time.perf_counter() - started - render_time - walk_planning
+    return stats
+
+
+def print_stats(stats):
+    print(f"Steps: {stats['steps']}")
+    print(f"Food eaten: {stats['food_eaten']}")
+    print(f"Planning time: {stats['planning_time'] * 1000:.2f} ms")
+    print(f"Movement time: {stats['movement_time'] * 1000:.2f} ms")
+    print(f"Render time: {stats['render_time'] * 1000:.2f} ms")
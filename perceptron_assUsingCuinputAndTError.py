@@ -1,12 +1,18 @@
 
+import argparse
+
 import numpy as np
 from sklearn.metrics import accuracy_score, confusion_matrix, classification_report
 
+from perceptron_using_UserInputAndGate import MultiLayerPerceptron
+
 class Perceptron:
-    def __init__(self, num_inputs=2, learning_rate=0.7, epochs=100):
+    def __init__(self, num_inputs=2, learning_rate=0.7, epochs=100, tolerance=0.25):
         self.learning_rate = learning_rate
         self.num_inputs = num_inputs
         self.epochs = epochs
+        # Below 0.25 total squared error every training row is on the right side of 0.5.
+        self.tolerance = tolerance
         self.weights = 2 * np.random.rand(num_inputs) - 1
         self.bias = np.random.rand(1)
 
@@ -15,32 +21,204 @@ class Perceptron:
         net_input = np.clip(net_input, -500, 500)
         return 1 / (1 + np.exp(-net_input))
 
+    def output(self, inputs):
+        """Sigmoid activation; one value per row for 2-D input."""
+        return self.sigmoid_func(np.dot(inputs, self.weights) + self.bias)
+
     def predict(self, inputs):
-        activation = np.dot(inputs, self.weights) + self.bias
-        return 1 if activation >= 0.5 else 0
+        """1/0 step on the sigmoid output; one label per row for 2-D input."""
+        labels = np.where(self.output(inputs) >= 0.5, 1, 0)
+        return int(labels[0]) if np.ndim(inputs) == 1 else labels
 
-    def train(self, training_inputs, training_outputs):
+    def train(self, training_inputs, training_outputs, batch_size=1, shuffle=False, seed=None):
+        """Delta-rule training of the sigmoid output over rows of `training_inputs`.
+
+        The rows are processed `batch_size` at a time: outputs, errors and
+        the summed weight update of a batch are array operations. The default
+        batch_size=1 is the per-sample update; batch_size=None trains full
+        batch. shuffle=True reorders the rows every epoch. Training stops once
+        an epoch's squared error drops below `tolerance`.
+        """
+        training_inputs = np.asarray(training_inputs, dtype=np.float64).reshape(-1, self.num_inputs)
+        training_outputs = np.asarray(training_outputs, dtype=np.float64).reshape(-1)
+        n = len(training_inputs)
+        batch_size = n if batch_size is None else max(1, min(batch_size, n))
+        rng = np.random.default_rng(seed)
+        order = np.arange(n)
         for epoch in range(self.epochs):
-            total_error = 0
-            for inputs, target in zip(training_inputs, training_outputs):
-                prediction = self.predict(inputs)
-                error = target - prediction
-                delta = error * prediction * (1 - prediction)
-                self.weights += self.learning_rate * delta * inputs
-                self.bias += self.learning_rate * delta
-                total_error += error ** 2
-            
+            if shuffle:
+                rng.shuffle(order)
+            total_error = 0.0
+            for start in range(0, n, batch_size):
+                rows = order[start:start + batch_size]
+                inputs, targets = training_inputs[rows], training_outputs[rows]
+                output = self.output(inputs)
+                error = targets - output
+                delta = error * output * (1 - output)
+                self.weights += self.learning_rate * (delta @ inputs)
+                self.bias += self.learning_rate * delta.sum()
+                total_error += float(error @ error)
          
-            if total_error  < 1e-5:
+            if total_error < self.tolerance:
                 print(f"Converged early at epoch {epoch}")
                 break
         
             if epoch == self.epochs - 1:
                 print(f"Total error after training: {total_error}")
-                
+
+
+class MultiOutputPerceptron:
+    """Several sigmoid units over the same inputs trained as one: column j
+    of the (num_inputs x num_outputs) weight matrix and bias[j] belong to
+    output j. Each output follows the delta rule on its sigmoid activation
+    and stops on its own once its epoch squared error drops below
+    `tolerance`; below 0.25 every training row is already on the right
+    side of 0.5."""
+    def __init__(self, num_inputs=2, num_outputs=1, learning_rate=0.7, epochs=100, tolerance=0.25):
+        self.learning_rate = learning_rate
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.epochs = epochs
+        self.tolerance = tolerance
+        self.weights = 2 * np.random.rand(num_inputs, num_outputs) - 1
+        self.bias = np.random.rand(num_outputs)
+        # Epoch at which each output converged (-1: never) and its last epoch error.
+        self.converged_epoch = np.full(num_outputs, -1)
+        self.total_error = np.zeros(num_outputs)
+
+    def sigmoid_func(self, net_input):
+        net_input = np.clip(net_input, -500, 500)
+        return 1 / (1 + np.exp(-net_input))
+
+    def output(self, inputs):
+        """Sigmoid activation per output: (rows x outputs) for 2-D input."""
+        return self.sigmoid_func(np.dot(inputs, self.weights) + self.bias)
+
+    def predict(self, inputs):
+        """1/0 label per output: (rows x outputs) for 2-D input, (outputs,) for one sample."""
+        return np.where(self.output(inputs) >= 0.5, 1, 0)
+
+    def train(self, training_inputs, training_outputs, batch_size=1, shuffle=False, seed=None):
+        """Batched delta-rule training like Perceptron.train, with one target
+        column per output; converged outputs are masked out of later updates."""
+        training_inputs = np.asarray(training_inputs, dtype=np.float64).reshape(-1, self.num_inputs)
+        training_outputs = np.asarray(training_outputs, dtype=np.float64).reshape(len(training_inputs), -1)
+        n = len(training_inputs)
+        batch_size = n if batch_size is None else max(1, min(batch_size, n))
+        rng = np.random.default_rng(seed)
+        order = np.arange(n)
+        active = np.ones(self.num_outputs, dtype=bool)
+        for epoch in range(self.epochs):
+            if shuffle:
+                rng.shuffle(order)
+            total_error = np.zeros(self.num_outputs)
+            for start in range(0, n, batch_size):
+                rows = order[start:start + batch_size]
+                inputs, targets = training_inputs[rows], training_outputs[rows]
+                output = self.output(inputs)
+                error = targets - output
+                delta = error * output * (1 - output) * active
+                self.weights += self.learning_rate * (inputs.T @ delta)
+                self.bias += self.learning_rate * delta.sum(axis=0)
+                total_error += (error * error).sum(axis=0)
+
+            self.total_error[active] = total_error[active]
+            done = active & (total_error < self.tolerance)
+            self.converged_epoch[done] = epoch
+            active &= ~done
+            if not active.any():
+                break
+
+
+# Logical target of each gate for 0/1 input columns a and b.
+GATES = {
+    "AND": lambda a, b: a & b,
+    "OR": lambda a, b: a | b,
+    "NAND": lambda a, b: 1 - (a & b),
+    "NOR": lambda a, b: 1 - (a | b),
+    "XOR": lambda a, b: a ^ b,
+}
+
+
+def train_gates_together(inputs, datasets, custom_inputs, batch_size=1, shuffle=False, seed=None,
+                         epochs=200):
+    """Trains every gate in `datasets` as one MultiOutputPerceptron and scores
+    them all on `custom_inputs` in one batch."""
+    gate_names = list(datasets)
+    perceptron = MultiOutputPerceptron(num_inputs=2, num_outputs=len(gate_names),
+                                       learning_rate=0.7, epochs=epochs)
+    perceptron.train(inputs, np.column_stack([datasets[g] for g in gate_names]),
+                     batch_size, shuffle, seed)
+
+    bits = np.where(custom_inputs >= 0.5, 1, 0)
+    targets = np.column_stack([GATES[g](bits[:, 0], bits[:, 1]) for g in gate_names])
+    predictions = perceptron.predict(custom_inputs)
+    accuracy = (predictions == targets).mean(axis=0)
+    # confusion[g, target, predicted] for every gate at once.
+    confusion = np.zeros((len(gate_names), 2, 2), dtype=int)
+    np.add.at(confusion, (np.arange(len(gate_names)), targets, predictions), 1)
+
+    for j, gate_name in enumerate(gate_names):
+        print(f"\n--- {gate_name} Gate (output {j}) ---")
+        if perceptron.converged_epoch[j] >= 0:
+            print(f"Converged early at epoch {perceptron.converged_epoch[j]}")
+        else:
+            print(f"Total error after training: {perceptron.total_error[j]}")
+        print(f"Final Weights: {perceptron.weights[:, j]}")
+        print(f"Final Bias: {perceptron.bias[j]}\n")
+        for test_in, target, pred in zip(custom_inputs, targets[:, j], predictions[:, j]):
+            print(f"Input: {test_in} | Logical Target: {target} | Prediction: {pred}")
+        report = classification_report(targets[:, j], predictions[:, j], labels=[0, 1], zero_division=0,
+                                       target_names=["Class 0", "Class 1"])
+        print(f"Accuracy: {accuracy[j]:.2%}")
+        print(f"Confusion Matrix (Target vs Predicted):\n{confusion[j]}")
+        print(f"Classification Report:\n{report}")
+        print("---------------------------------")
+
+
+def check_gates_converge(inputs, datasets, epochs=200, seed=None):
+    """Trains the gates as one MultiOutputPerceptron per-sample and full
+    batch and raises AssertionError unless the weights moved and every
+    output converged and reproduces its truth table."""
+    gate_names = list(datasets)
+    targets = np.column_stack([datasets[g] for g in gate_names])
+    for batch_size in (1, None):
+        np.random.seed(seed)
+        perceptron = MultiOutputPerceptron(num_inputs=2, num_outputs=len(gate_names),
+                                           learning_rate=0.7, epochs=epochs)
+        initial = perceptron.weights.copy(), perceptron.bias.copy()
+        perceptron.train(inputs, targets, batch_size)
+        mode = "full batch" if batch_size is None else f"batch size {batch_size}"
+        assert (perceptron.weights != initial[0]).all() and (perceptron.bias != initial[1]).all(), \
+            f"{mode}: weights did not change"
+        stuck = [g for g, e in zip(gate_names, perceptron.converged_epoch) if e < 0]
+        assert not stuck, f"{mode}: {', '.join(stuck)} did not converge in {epochs} epochs"
+        assert (perceptron.predict(inputs) == targets).all(), f"{mode}: truth tables not reproduced"
+        print(f"{mode}: {', '.join(f'{g} at epoch {e}' for g, e in zip(gate_names, perceptron.converged_epoch))}")
+
+
 if __name__ == "__main__":
 
-   
+    parser = argparse.ArgumentParser(description="Train a perceptron for each logic gate.")
+    parser.add_argument("--batch-size", type=int, default=1, help="rows per weight update; 0 for full batch")
+    parser.add_argument("--shuffle", action="store_true", help="reorder the rows every epoch")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the initial weights and the shuffle order")
+    parser.add_argument("--multi-output", action="store_true",
+                        help="train all gates at once as one weight matrix")
+    parser.add_argument("--hidden", type=int, nargs="*", default=[],
+                        help="train a sigmoid network with these hidden layer sizes (adds XOR)")
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--check", action="store_true",
+                        help="verify that the multi-output perceptron learns every gate, then exit")
+    args = parser.parse_args()
+    if args.multi_output and args.hidden:
+        # XOR is not linearly separable, so one weight matrix cannot learn it.
+        parser.error("--multi-output trains single-layer units; it cannot be combined with --hidden")
+    batch_size = args.batch_size or None
+    # Seeds the weight initialization too, so a seeded run is reproducible.
+    np.random.seed(args.seed)
+
     inputs = np.array([
         [0, 0],
         [0, 1],
@@ -54,6 +232,8 @@ if __name__ == "__main__":
         "NOR":  np.array([1, 0, 0, 0]),
         "NAND": np.array([1, 1, 1, 0])
     }
+    if args.hidden:
+        datasets["XOR"] = np.array([0, 1, 1, 0])
 
     
     custom_inputs = np.array([
@@ -63,11 +243,23 @@ if __name__ == "__main__":
         [0.9, 0.7]  
     ])
     
+    if args.check:
+        check_gates_converge(inputs, datasets, args.epochs, args.seed)
+        raise SystemExit
+
+    if args.multi_output:
+        train_gates_together(inputs, datasets, custom_inputs, batch_size, args.shuffle, args.seed,
+                             args.epochs)
+        raise SystemExit
+
     for gate_name, outputs in datasets.items():
         
         print(f"\n--- Training for {gate_name} Gate ---")
-        perceptron = Perceptron(num_inputs=2, learning_rate=0.7, epochs=200)
-        perceptron.train(inputs, outputs)
+        if args.hidden:
+            perceptron = MultiLayerPerceptron(2, args.hidden, 1, learning_rate=0.7, epochs=args.epochs)
+        else:
+            perceptron = Perceptron(num_inputs=2, learning_rate=0.7, epochs=args.epochs)
+        perceptron.train(inputs, outputs, batch_size, args.shuffle, args.seed)
 
         print(f"Final Weights: {perceptron.weights}")
         print(f"Final Bias: {perceptron.bias}\n")
@@ -93,6 +285,8 @@ if __name__ == "__main__":
                 target = int(not (in1 & in2))
             elif gate_name == "NOR":
                 target = int(not (in1 | in2))
+            elif gate_name == "XOR":
+                target = in1 ^ in2
             else:
                 target = None
 
@@ -1,3 +1,5 @@
+import argparse
+
 import numpy as np
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
@@ -9,26 +11,49 @@ class Perceptron:
         self.weights = 2 * np.random.rand(num_inputs) - 1
         self.bias = np.random.rand(1)
     
-    def sigmoid(self, net_inputs):
-        
-        net_inputs = np.clip(net_inputs, -500, 500)
-        return 1 / (1 + np.exp(-net_inputs))
+    def sigmoid(self, net_inputs, out=None):
+        if out is None:
+            net_inputs = np.clip(net_inputs, -500, 500)
+            return 1 / (1 + np.exp(-net_inputs))
+        # Same values, computed in place in a preallocated `out`.
+        np.clip(net_inputs, -500, 500, out=out)
+        np.negative(out, out=out)
+        np.exp(out, out=out)
+        out += 1
+        return np.reciprocal(out, out=out)
 
     def predict(self, inputs):
+        """Sigmoid output; one value per row for 2-D input."""
         weighted_sum = np.dot(inputs, self.weights) + self.bias
         return self.sigmoid(weighted_sum)
 
-    def train(self, training_inputs, training_outputs):
+    def train(self, training_inputs, training_outputs, batch_size=1, shuffle=False, seed=None):
+        """Delta-rule training over rows of `training_inputs`.
+
+        The rows are processed `batch_size` at a time: predictions, errors and
+        the summed weight update of a batch are array operations. The default
+        batch_size=1 is the original per-sample update; batch_size=None
+        trains full batch. shuffle=True reorders the rows every epoch.
+        """
+        training_inputs = np.asarray(training_inputs, dtype=np.float64).reshape(-1, self.num_inputs)
+        training_outputs = np.asarray(training_outputs, dtype=np.float64).reshape(-1)
+        n = len(training_inputs)
+        batch_size = n if batch_size is None else max(1, min(batch_size, n))
+        rng = np.random.default_rng(seed)
+        order = np.arange(n)
         for epoch in range(self.epochs):
-            total_error = 0
-            for inputs, target in zip(training_inputs, training_outputs):
+            if shuffle:
+                rng.shuffle(order)
+            total_error = 0.0
+            for start in range(0, n, batch_size):
+                rows = order[start:start + batch_size]
+                inputs, targets = training_inputs[rows], training_outputs[rows]
                 prediction = self.predict(inputs)
-                error = target - prediction
+                error = targets - prediction
                 delta = error * prediction * (1 - prediction)
-                self.weights += self.learning_rate * delta * inputs
-                self.bias += self.learning_rate * delta
-                total_error += error ** 2
-            
+                self.weights += self.learning_rate * (delta @ inputs)
+                self.bias += self.learning_rate * delta.sum()
+                total_error += float(error @ error)
            
             if total_error < 1e-5:
                 print(f"Converged early at epoch {epoch}")
@@ -38,10 +63,116 @@ class Perceptron:
                
                 print(f"Total error after training: {total_error}")
 
-            
+
+class MultiLayerPerceptron(Perceptron):
+    """A Perceptron with hidden layers, trained by backpropagation.
+
+    Every layer is a sigmoid (Perceptron.sigmoid) unit layer; weights[i] maps
+    layer_sizes[i] to layer_sizes[i + 1]. Training minimizes the same
+    squared error with the same output delta as Perceptron.train, and
+    pushes deltas back through the hidden layers. Forward and backward
+    passes are matrix operations over a batch. Activations, deltas and
+    gradients live in buffers allocated once per train() call and every
+    step writes into them in place.
+    """
+    def __init__(self, num_inputs=2, hidden_layers=(4,), num_outputs=1, learning_rate=0.7, epochs=10000):
+        super().__init__(num_inputs, learning_rate, epochs)
+        self.layer_sizes = [num_inputs, *hidden_layers, num_outputs]
+        self.weights = [2 * np.random.rand(a, b) - 1
+                        for a, b in zip(self.layer_sizes, self.layer_sizes[1:])]
+        self.bias = [np.random.rand(b) for b in self.layer_sizes[1:]]
+
+    def predict(self, inputs):
+        """Output activations, one row per input row. A single sample with
+        a single output gives a float."""
+        output = np.asarray(inputs, dtype=np.float64)
+        for weights, bias in zip(self.weights, self.bias):
+            output = self.sigmoid(np.dot(output, weights) + bias)
+        if self.layer_sizes[-1] == 1:
+            return float(output[0]) if output.ndim == 1 else output[:, 0]
+        return output
+
+    def _allocate(self, batch_size):
+        sizes = self.layer_sizes[1:]
+        self.batch_inputs = np.empty((batch_size, self.num_inputs))
+        self.batch_targets = np.empty((batch_size, sizes[-1]))
+        self.error = np.empty((batch_size, sizes[-1]))
+        self.activations = [np.empty((batch_size, size)) for size in sizes]
+        self.deltas = [np.empty((batch_size, size)) for size in sizes]
+        self.slopes = [np.empty((batch_size, size)) for size in sizes]
+        self.weight_steps = [np.empty_like(w) for w in self.weights]
+        self.bias_steps = [np.empty_like(b) for b in self.bias]
+
+    def _step(self, count):
+        """Forward and backward pass over the first `count` rows of the batch
+        buffers, updating the weights. Returns the batch's squared error."""
+        inputs = self.batch_inputs[:count]
+        layer_input = inputs
+        for weights, bias, activation in zip(self.weights, self.bias, self.activations):
+            out = activation[:count]
+            np.dot(layer_input, weights, out=out)
+            out += bias
+            self.sigmoid(out, out=out)
+            layer_input = out
+
+        error = self.error[:count]
+        np.subtract(self.batch_targets[:count], layer_input, out=error)
+        # Output delta, error * prediction * (1 - prediction) as in Perceptron.train.
+        delta = self.deltas[-1][:count]
+        slope = self.slopes[-1][:count]
+        np.subtract(1, layer_input, out=slope)
+        slope *= layer_input
+        np.multiply(error, slope, out=delta)
+
+        for layer in range(len(self.weights) - 1, -1, -1):
+            previous = inputs if layer == 0 else self.activations[layer - 1][:count]
+            np.dot(previous.T, delta, out=self.weight_steps[layer])
+            np.sum(delta, axis=0, out=self.bias_steps[layer])
+            if layer > 0:
+                # Propagate through this layer's weights before updating them.
+                next_delta = self.deltas[layer - 1][:count]
+                np.dot(delta, self.weights[layer].T, out=next_delta)
+                slope = self.slopes[layer - 1][:count]
+                np.subtract(1, previous, out=slope)
+                slope *= previous
+                next_delta *= slope
+                delta = next_delta
+            self.weight_steps[layer] *= self.learning_rate
+            self.weights[layer] += self.weight_steps[layer]
+            self.bias_steps[layer] *= self.learning_rate
+            self.bias[layer] += self.bias_steps[layer]
+        return float(np.vdot(error, error))
+
+    def train(self, training_inputs, training_outputs, batch_size=1, shuffle=False, seed=None):
+        """Backpropagation over `batch_size` rows at a time (None: full
+        batch), with the same shuffling and early stop as Perceptron.train."""
+        training_inputs = np.asarray(training_inputs, dtype=np.float64).reshape(-1, self.num_inputs)
+        training_outputs = np.asarray(training_outputs, dtype=np.float64).reshape(len(training_inputs), -1)
+        n = len(training_inputs)
+        batch_size = n if batch_size is None else max(1, min(batch_size, n))
+        self._allocate(batch_size)
+        rng = np.random.default_rng(seed)
+        order = np.arange(n)
+        for epoch in range(self.epochs):
+            if shuffle:
+                rng.shuffle(order)
+            total_error = 0.0
+            for start in range(0, n, batch_size):
+                rows = order[start:start + batch_size]
+                count = len(rows)
+                np.take(training_inputs, rows, axis=0, out=self.batch_inputs[:count])
+                np.take(training_outputs, rows, axis=0, out=self.batch_targets[:count])
+                total_error += self._step(count)
+
+            if total_error < 1e-5:
+                print(f"Converged early at epoch {epoch}")
+                break
+
+            if epoch == self.epochs - 1:
+                print(f"Total error after training: {total_error}")
 
 
-def main():
+def main(batch_size=1, shuffle=False, seed=None, hidden_layers=()):
     input_size = 2
     training_inputs = np.array(
         [
@@ -53,20 +184,30 @@ def main():
         "OR": np.array([0, 1, 1, 1]),
         "AND": np.array([0, 0, 0, 1]),
         "NAND": np.array([1, 1, 1, 0]), 
-        "NOR": np.array([1, 0, 0, 0])  
+        "NOR": np.array([1, 0, 0, 0]),
+        # Not linearly separable: these need hidden layers (--hidden).
+        "XOR": np.array([0, 1, 1, 0]),
+        "XNOR": np.array([1, 0, 0, 1])
     }
     
-    perceptron = Perceptron(input_size,0.4,10000)
+    # Seeds the weight initialization too, so a seeded run is reproducible.
+    np.random.seed(seed)
+    if hidden_layers:
+        perceptron = MultiLayerPerceptron(input_size, hidden_layers, 1, 0.4, 10000)
+    else:
+        perceptron = Perceptron(input_size,0.4,10000)
     
     while True:
-        gate = input("Enter the gate name (AND, OR, NAND, NOR): ").upper().strip()
+        gate = input("Enter the gate name (AND, OR, NAND, NOR, XOR, XNOR): ").upper().strip()
         if gate in gate_outputs:
             break
         print("Invalid gate name. Please try again.")
+    if gate in ("XOR", "XNOR") and not hidden_layers:
+        print(f"Note: {gate} is not linearly separable; run with --hidden 4 to learn it.")
   
     target = gate_outputs[gate]
     print(f"---Training for {gate} gate----")
-    perceptron.train(training_inputs, target)
+    perceptron.train(training_inputs, target, batch_size, shuffle, seed)
     
     print(f"Final weights: {perceptron.weights}")
     print(f"Final bias: {perceptron.bias}")
@@ -96,4 +237,12 @@ def main():
             if toQuit == 'q':
                 return
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train a perceptron for a logic gate and test it interactively.")
+    parser.add_argument("--batch-size", type=int, default=1, help="rows per weight update; 0 for full batch")
+    parser.add_argument("--shuffle", action="store_true", help="reorder the rows every epoch")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the initial weights and the shuffle order")
+    parser.add_argument("--hidden", type=int, nargs="*", default=[],
+                        help="hidden layer sizes, e.g. --hidden 4 (default: single-layer perceptron)")
+    args = parser.parse_args()
+    main(args.batch_size or None, args.shuffle, args.seed, tuple(args.hidden))
\ No newline at end of file
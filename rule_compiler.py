@@ -0,0 +1,82 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+class CompiledRuleBase:
+    """Rules compiled to sparse matrices for forward chaining many fact sets at once.
+
+    Every condition and conclusion gets a column in a symbol table and a
+    batch of fact sets is a (patients x symbols) boolean matrix. The rules
+    become a (rules x symbols) condition-incidence matrix C, with the number
+    of distinct conditions of each rule alongside, and a (symbols x rules)
+    conclusion-incidence matrix. One round of inference counts each rule's
+    satisfied conditions for every patient as C @ facts.T, fires the rules
+    whose count reaches their condition count, maps the fired rules to
+    their conclusions with the second product, and repeats on the rows that
+    changed until nothing new is inferred.
+    """
+    def __init__(self, rules):
+        self.rules = rules
+        self.symbols = []
+        self.symbol_index = {}
+        for rule in rules:
+            for symbol in list(rule["if"]) + [rule["then"]]:
+                if symbol not in self.symbol_index:
+                    self.symbol_index[symbol] = len(self.symbols)
+                    self.symbols.append(symbol)
+
+        rule_ids, condition_ids = [], []
+        for i, rule in enumerate(rules):
+            for cond in set(rule["if"]):
+                rule_ids.append(i)
+                condition_ids.append(self.symbol_index[cond])
+        shape = (len(rules), len(self.symbols))
+        # float32 products are exact for any realistic condition count.
+        self.conditions = sp.csr_matrix((np.ones(len(rule_ids), dtype=np.float32),
+                                         (rule_ids, condition_ids)), shape=shape)
+        # Rules without conditions have a count of 0 and always fire.
+        self.condition_counts = np.bincount(rule_ids, minlength=len(rules)).astype(np.float32)
+        conclusion_ids = [self.symbol_index[rule["then"]] for rule in rules]
+        self.conclusions = sp.csr_matrix((np.ones(len(rules), dtype=np.float32),
+                                          (conclusion_ids, np.arange(len(rules)))), shape=shape[::-1])
+
+    def encode(self, fact_sets):
+        """Boolean (len(fact_sets) x symbols) matrix; unknown facts are dropped."""
+        facts = np.zeros((len(fact_sets), len(self.symbols)), dtype=bool)
+        index = self.symbol_index
+        for row, fact_set in enumerate(fact_sets):
+            cols = [index[f] for f in fact_set if f in index]
+            facts[row, cols] = True
+        return facts
+
+    def infer(self, facts, chunk_rows=1024):
+        """Fixpoint of the rules over a boolean fact matrix, one row per patient.
+
+        Rows are independent, so they are processed in chunks of `chunk_rows`
+        to bound the (rules x rows) intermediates.
+        """
+        result = np.empty_like(facts)
+        if not len(self.rules):
+            result[:] = facts
+            return result
+        for start in range(0, len(facts), chunk_rows):
+            # (symbols x rows), so both products take the fact columns directly.
+            chunk = np.ascontiguousarray(facts[start:start + chunk_rows].T)
+            active = np.arange(chunk.shape[1])
+            while len(active):
+                current = chunk[:, active]
+                satisfied = self.conditions @ current.astype(np.float32)
+                fired = (satisfied >= self.condition_counts[:, None]).astype(np.float32)
+                updated = current | (self.conclusions @ fired > 0)
+                changed = (updated != current).any(axis=0)
+                chunk[:, active] = updated
+                active = active[changed]
+            result[start:start + chunk_rows] = chunk.T
+        return result
+
+    def forward_chaining_batch(self, fact_sets):
+        """Same result as forward_chaining(facts) for each fact set."""
+        inferred = self.infer(self.encode(fact_sets))
+        symbols = self.symbols
+        return [set(fact_set) | {symbols[j] for j in np.flatnonzero(row)}
+                for fact_set, row in zip(fact_sets, inferred)]
@@ -0,0 +1,130 @@
+import argparse
+import collections
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from spam_data import detect_encoding
+from spam_model import SpamModel
+
+LABELS = {0: "ham", 1: "spam"}
+
+_worker_model = None
+
+
+def read_chunks(path, fmt, column, chunksize, encoding=None):
+    """Yields lists of up to `chunksize` messages from a CSV or JSONL file.
+    JSONL lines may be objects (the message is under `column`) or bare strings.
+    The encoding defaults to spam_data.detect_encoding, as the shared loader uses."""
+    with open(path, newline="", encoding=encoding or detect_encoding(path)) as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            if column not in (reader.fieldnames or []):
+                raise ValueError(f"{path} has no {column!r} column")
+            messages = (row[column] or "" for row in reader)
+        else:
+            messages = (_jsonl_message(line, column) for line in f if line.strip())
+        chunk = []
+        for message in messages:
+            chunk.append(message)
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _jsonl_message(line, column):
+    record = json.loads(line)
+    return record if isinstance(record, str) else record.get(column) or ""
+
+
+def format_scores(model, start, messages, fmt):
+    """Scores one chunk and renders its output lines; row numbers start at `start`."""
+    lines = []
+    for row, message in enumerate(messages, start):
+        label, spam = model.score(message)
+        if fmt == "csv":
+            lines.append(f"{row},{LABELS[label]},{spam:.6f}\n")
+        else:
+            lines.append(json.dumps({"row": row, "prediction": LABELS[label],
+                                     "spam_probability": round(spam, 6)}) + "\n")
+    return "".join(lines)
+
+
+def _init_worker(model_path):
+    global _worker_model
+    _worker_model = SpamModel.load(model_path)
+
+
+def _score_chunk(start, messages, fmt):
+    return format_scores(_worker_model, start, messages, fmt)
+
+
+def score_file(model_path, in_path, out, fmt, column="Messages", chunksize=10000,
+               processes=None, encoding=None):
+    """Scores every message in `in_path` and writes one output line per
+    message to `out`, in input order. Returns the number of messages.
+
+    Chunks are scored across a Pool whose workers each load the model once.
+    At most two chunks per worker are in flight, so memory stays bounded
+    however large the input is.
+    """
+    if fmt == "csv":
+        out.write("row,prediction,spam_probability\n")
+    chunks = read_chunks(in_path, fmt, column, chunksize, encoding)
+    total = 0
+
+    if processes == 1:
+        model = SpamModel.load(model_path)
+        for messages in chunks:
+            out.write(format_scores(model, total, messages, fmt))
+            total += len(messages)
+        return total
+
+    processes = processes or os.cpu_count()
+    pending = collections.deque()
+    with multiprocessing.Pool(processes, _init_worker, (model_path,)) as pool:
+        for messages in chunks:
+            if len(pending) >= 2 * processes:
+                out.write(pending.popleft().get())
+            pending.append(pool.apply_async(_score_chunk, (total, messages, fmt)))
+            total += len(messages)
+        while pending:
+            out.write(pending.popleft().get())
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV or JSONL file of messages with a trained spam model.")
+    parser.add_argument("input")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--model", default="spam_model_multi.npz",
+                        help="artifact written by the spam scripts")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="input and output format (default: from the input extension)")
+    parser.add_argument("--column", default="Messages", help="CSV column or JSONL key holding the message")
+    parser.add_argument("--encoding", default=None,
+                        help="input encoding (default: UTF-8 if the whole file decodes as it, else latin-1)")
+    parser.add_argument("--chunksize", type=int, default=10000)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        parser.error(f"{args.model} not found; run Spam_Detection_UsingMultilpeInput.py to train it")
+    fmt = args.format or ("jsonl" if args.input.endswith((".jsonl", ".json")) else "csv")
+
+    started = time.perf_counter()
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        count = score_file(args.model, args.input, out, fmt, args.column, args.chunksize,
+                           args.processes, args.encoding)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(f"Scored {count} messages in {elapsed:.2f} s ({count / max(elapsed, 1e-9):.0f} msg/s)",
+          file=sys.stderr)
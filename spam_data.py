@@ -0,0 +1,169 @@
+import array
+import codecs
+import csv
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+# Bump when the cache layout or normalization changes, to invalidate old caches.
+CACHE_VERSION = "1"
+
+LABELS = {"ham": 0, "spam": 1}
+
+
+class MessageDataset:
+    """Messages and 0/1 labels backed by memory-mapped arrays.
+
+    The messages are one UTF-8 byte blob; message i is
+    blob[offsets[i]:offsets[i + 1]]. Nothing is decoded until asked for.
+    """
+    def __init__(self, blob, offsets, labels, encoding):
+        self.blob = blob
+        self.offsets = offsets
+        self.labels = labels
+        self.encoding = encoding
+
+    def __len__(self):
+        return len(self.labels)
+
+    def messages(self, start=0, stop=None):
+        """Decoded messages start..stop (all of them by default)."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return []
+        offsets = self.offsets[start:stop + 1].tolist()
+        base = offsets[0]
+        raw = self.blob[base:offsets[-1]].tobytes()
+        return [raw[a - base:b - base].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def chunks(self, size):
+        """Yields (messages, labels) for consecutive slices of `size` rows."""
+        for start in range(0, len(self), size):
+            yield self.messages(start, start + size), np.asarray(self.labels[start:start + size])
+
+
+def _parse_rows(f):
+    """(label, message) per row of an open Category/Messages CSV; label is
+    None for anything but ham/spam."""
+    for row in csv.DictReader(f):
+        yield LABELS.get((row.get("Category") or "").strip().lower()), row.get("Messages") or ""
+
+
+def detect_encoding(path):
+    """"utf-8-sig" if the whole file decodes as UTF-8 (BOM tolerated),
+    otherwise "latin-1", which decodes any byte string. Reads the file in
+    blocks, so memory stays flat."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with open(path, "rb") as f:
+        try:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            return "latin-1"
+    return "utf-8-sig"
+
+
+def iter_chunks(path, size):
+    """Yields (messages, int8 labels) for consecutive `size`-row chunks of
+    the CSV itself, with the same encoding and label handling as
+    load_messages but no cached copy, so memory is bounded by the chunk
+    size whatever the file size."""
+    with open(path, newline="", encoding=detect_encoding(path)) as f:
+        messages, labels = [], []
+        for label, message in _parse_rows(f):
+            if label is None:
+                continue
+            messages.append(message)
+            labels.append(label)
+            if len(messages) == size:
+                yield messages, np.array(labels, dtype=np.int8)
+                messages, labels = [], []
+        if messages:
+            yield messages, np.array(labels, dtype=np.int8)
+
+
+def _write_columns(path, encoding, cache_path):
+    offsets = array.array("q", [0])
+    labels = bytearray()
+    skipped = 0
+    with open(path, newline="", encoding=encoding) as f, \
+            open(os.path.join(cache_path, "messages.bin"), "wb") as blob:
+        for label, message in _parse_rows(f):
+            if label is None:
+                skipped += 1
+                continue
+            data = message.encode("utf-8")
+            blob.write(data)
+            offsets.append(offsets[-1] + len(data))
+            labels.append(label)
+
+    np.save(os.path.join(cache_path, "offsets.npy"), np.frombuffer(offsets, dtype=np.int64))
+    np.save(os.path.join(cache_path, "labels.npy"), np.frombuffer(bytes(labels), dtype=np.int8))
+    return {"encoding": encoding, "rows": len(labels), "skipped": skipped}
+
+
+def _build_cache(path, cache_path):
+    tmp_path = cache_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    try:
+        # Same choice as detect_encoding, without a separate pass when the
+        # file is UTF-8.
+        meta = _write_columns(path, "utf-8-sig", tmp_path)
+    except UnicodeDecodeError:
+        meta = _write_columns(path, "latin-1", tmp_path)
+    meta["source"] = os.path.abspath(path)
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    shutil.rmtree(cache_path, ignore_errors=True)
+    os.replace(tmp_path, cache_path)
+
+
+def _evict_superseded(cache_dir, cache_path, source):
+    """Deletes caches of `source` other than `cache_path`: copies of earlier
+    versions of the file, or from an older CACHE_VERSION."""
+    for name in os.listdir(cache_dir):
+        other = os.path.join(cache_dir, name)
+        if other == cache_path:
+            continue
+        try:
+            with open(os.path.join(other, "meta.json")) as f:
+                superseded = json.load(f).get("source") == source
+        except (OSError, ValueError):
+            continue
+        if superseded:
+            shutil.rmtree(other, ignore_errors=True)
+
+
+def load_messages(path="spam_mail.csv", cache_dir=".spam_cache"):
+    """Category/Messages CSV as a MessageDataset.
+
+    The first load detects the file's encoding, maps ham/spam to 0/1 (other
+    labels are dropped) and writes a columnar copy under `cache_dir`, keyed
+    by a SHA-256 of the absolute path, size and mtime. Later loads
+    memory-map that copy instead of parsing the CSV. Building a new copy
+    deletes the ones left from earlier versions of the same file.
+    Building holds 9 bytes of offsets and labels per row in memory; to
+    stream a file of any size in flat memory, use iter_chunks instead.
+    """
+    stat = os.stat(path)
+    key = f"{CACHE_VERSION}\0{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}"
+    cache_path = os.path.join(cache_dir, hashlib.sha256(key.encode()).hexdigest())
+    if not os.path.exists(os.path.join(cache_path, "meta.json")):
+        os.makedirs(cache_dir, exist_ok=True)
+        _build_cache(path, cache_path)
+        _evict_superseded(cache_dir, cache_path, os.path.abspath(path))
+
+    with open(os.path.join(cache_path, "meta.json")) as f:
+        meta = json.load(f)
+    blob_path = os.path.join(cache_path, "messages.bin")
+    # An empty file cannot be memory-mapped.
+    blob = np.memmap(blob_path, dtype=np.uint8, mode="r") if os.path.getsize(blob_path) \
+        else np.zeros(0, dtype=np.uint8)
+    return MessageDataset(blob, np.load(os.path.join(cache_path, "offsets.npy"), mmap_mode="r"),
+                          np.load(os.path.join(cache_path, "labels.npy"), mmap_mode="r"),
+                          meta["encoding"])
@@ -0,0 +1,367 @@
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import time
+
+import numpy as np
+
+from spam_data import iter_chunks
+
+# Bump when the artifact layout changes; older artifacts are then retrained.
+ARTIFACT_VERSION = 2
+
+# CountVectorizer's defaults: lowercase, then runs of 2+ word characters.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def tokenize(message):
+    return TOKEN_PATTERN.findall(message.lower())
+
+
+def murmurhash3_32(data, seed=0):
+    """Signed MurmurHash3 (x86, 32-bit) of `data` bytes, as HashingVectorizer uses."""
+    c1, c2, mask = 0xcc9e2d51, 0x1b873593, 0xffffffff
+    h = seed
+    tail = len(data) & ~3
+    for i in range(0, tail, 4):
+        k = int.from_bytes(data[i:i + 4], "little")
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        h ^= (k * c2) & mask
+        h = ((h << 13) | (h >> 19)) & mask
+        h = (h * 5 + 0xe6546b64) & mask
+    k = int.from_bytes(data[tail:], "little")
+    if k:
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        h ^= (k * c2) & mask
+    h ^= len(data)
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & mask
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & mask
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+class HashedVocabulary:
+    """Stands in for the vocabulary dict of a model trained on
+    HashingVectorizer(alternate_sign=False) features: every token is in it
+    and maps to its hashed column. The columns of the last `cache_size`
+    distinct tokens are memoized, so long-running scorers stay bounded."""
+    def __init__(self, n_features, cache_size=1 << 16):
+        self.n_features = n_features
+        self.column = functools.lru_cache(maxsize=cache_size)(self._hash_column)
+
+    def _hash_column(self, token):
+        h = murmurhash3_32(token.encode("utf-8"))
+        # abs(-2**31) overflows in the Cython original; match what it computes.
+        if h == -2147483648:
+            return (2147483647 - (self.n_features - 1)) % self.n_features
+        return abs(h) % self.n_features
+
+    def __contains__(self, token):
+        return True
+
+    def __getitem__(self, token):
+        return self.column(token)
+
+
+class HashedTokenWeights:
+    """Token -> log-likelihood ratio for a hashed model. Reads through the
+    token's column each time, since updates change columns, not tokens."""
+    def __init__(self, vocabulary, column_weights):
+        self.vocabulary = vocabulary
+        self.column_weights = column_weights
+
+    def get(self, token, default=None):
+        return self.column_weights[self.vocabulary[token]]
+
+
+def data_fingerprint(path):
+    """Size, mtime and SHA-256 of a training file."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha.hexdigest()}
+
+
+class SpamModel:
+    """A trained MultinomialNB + CountVectorizer reduced to plain arrays.
+
+    The artifact keeps the vocabulary, the per-class token counts and the
+    class counts, so loading it needs neither pandas nor scikit-learn and
+    labelled messages can be folded in later with partial_fit. Feature log
+    probabilities are held as log(count + alpha) per column minus one log
+    denominator per class, so an update only touches the columns its
+    messages use.
+    """
+    def __init__(self, vocabulary, feature_count, class_count, alpha, classes, metadata):
+        self.vocabulary = vocabulary
+        self.alpha = alpha
+        self.classes = classes
+        self.metadata = metadata
+        self.n_features = feature_count.shape[1]
+        self.feature_count = np.array(feature_count, dtype=np.float64)
+        self.class_count = np.array(class_count, dtype=np.float64)
+        self.feature_total = self.feature_count.sum(axis=1)
+        self.log_numerator = np.log(self.feature_count + alpha)
+        self._update_denominators()
+
+        # For score(): with two classes the posterior only depends on the
+        # log odds, which is the prior log odds plus one log-likelihood
+        # ratio per known token occurrence.
+        ratios = (self.log_numerator[1] - self.log_numerator[0]).tolist()
+        if isinstance(vocabulary, HashedVocabulary):
+            self.column_log_ratio = ratios
+            self.token_log_ratio = HashedTokenWeights(vocabulary, ratios)
+        else:
+            self.token_log_ratio = {token: ratios[col] for token, col in vocabulary.items()}
+
+    def _update_denominators(self):
+        self.log_denominator = np.log(self.feature_total + self.alpha * self.n_features)
+        self.class_log_prior = np.log(self.class_count) - np.log(self.class_count.sum())
+        self.prior_log_odds = float(self.class_log_prior[1] - self.class_log_prior[0])
+        self.denominator_log_ratio = float(self.log_denominator[1] - self.log_denominator[0])
+
+    @property
+    def feature_log_prob(self):
+        return self.log_numerator[:, :self.n_features] - self.log_denominator[:, None]
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, model, metadata):
+        if hasattr(vectorizer, "vocabulary_"):
+            vocabulary = dict(vectorizer.vocabulary_)
+        else:
+            vocabulary = HashedVocabulary(vectorizer.n_features)
+            metadata = dict(metadata, n_features=vectorizer.n_features)
+        return cls(vocabulary, model.feature_count_, model.class_count_, float(model.alpha),
+                   model.classes_, metadata)
+
+    def save(self, path):
+        if isinstance(self.vocabulary, HashedVocabulary):
+            tokens = []
+        else:
+            tokens = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        metadata = dict(self.metadata, version=ARTIFACT_VERSION)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, vocabulary=np.array(tokens),
+                 feature_count=self.feature_count[:, :self.n_features],
+                 class_count=self.class_count, alpha=self.alpha, classes=self.classes,
+                 metadata=np.array(json.dumps(metadata)))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read_metadata(path):
+        with np.load(path, allow_pickle=False) as data:
+            return json.loads(str(data["metadata"]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data["metadata"]))
+            if "n_features" in metadata:
+                vocabulary = HashedVocabulary(metadata["n_features"])
+            else:
+                vocabulary = {token: i for i, token in enumerate(data["vocabulary"].tolist())}
+            return cls(vocabulary, data["feature_count"], data["class_count"], float(data["alpha"]),
+                       data["classes"], metadata)
+
+    def _add_token(self, token):
+        col = self.n_features
+        if col == self.feature_count.shape[1]:
+            # Grow by doubling so appending tokens is amortized O(1).
+            grow = max(col, 1024)
+            self.feature_count = np.concatenate([self.feature_count, np.zeros((2, grow))], axis=1)
+            self.log_numerator = np.concatenate(
+                [self.log_numerator, np.full((2, grow), np.log(self.alpha))], axis=1)
+        self.vocabulary[token] = col
+        self.token_log_ratio[token] = 0.0
+        self.n_features += 1
+        return col
+
+    def partial_fit(self, messages, labels):
+        """Folds labelled messages into the counts.
+
+        Same result as refitting CountVectorizer + MultinomialNB on the
+        original training set plus these messages: unseen tokens are
+        appended to the vocabulary (hashed models have none to extend).
+        Costs time proportional to the messages, not the vocabulary.
+        Returns the number of tokens added.
+        """
+        row_of = {label: row for row, label in enumerate(self.classes.tolist())}
+        vocabulary = self.vocabulary
+        added = self.n_features
+        touched = {}
+        for message, label in zip(messages, labels):
+            row = row_of[label]
+            self.class_count[row] += 1
+            for token in tokenize(message):
+                col = vocabulary[token] if token in vocabulary else self._add_token(token)
+                self.feature_count[row, col] += 1
+                self.feature_total[row] += 1
+                touched[col] = token
+
+        hashed = isinstance(vocabulary, HashedVocabulary)
+        for col, token in touched.items():
+            self.log_numerator[:, col] = np.log(self.feature_count[:, col] + self.alpha)
+            ratio = float(self.log_numerator[1, col] - self.log_numerator[0, col])
+            if hashed:
+                self.column_log_ratio[col] = ratio
+            else:
+                self.token_log_ratio[token] = ratio
+        self._update_denominators()
+        return self.n_features - added
+
+    def joint_log_likelihood(self, messages):
+        # One gather over every message's token columns, then one segmented sum.
+        vocabulary = self.vocabulary
+        cols, lengths = [], []
+        for message in messages:
+            tokens = [vocabulary[t] for t in tokenize(message) if t in vocabulary]
+            cols.extend(tokens)
+            lengths.append(len(tokens))
+        lengths = np.array(lengths, dtype=np.float64)
+        jll = self.class_log_prior - lengths[:, None] * self.log_denominator
+        if cols:
+            starts = (np.cumsum(lengths) - lengths).astype(np.intp)
+            nonempty = lengths > 0
+            jll[nonempty] += np.add.reduceat(self.log_numerator[:, cols], starts[nonempty], axis=1).T
+        return jll
+
+    def predict_proba(self, messages):
+        jll = self.joint_log_likelihood(messages)
+        jll -= jll.max(axis=1, keepdims=True)
+        probs = np.exp(jll)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def predict(self, messages):
+        return self.classes[self.joint_log_likelihood(messages).argmax(axis=1)]
+
+    def score(self, message):
+        """(label, spam probability) for one message without building arrays;
+        agrees with predict / predict_proba up to float rounding."""
+        ratio = self.token_log_ratio
+        log_odds = self.prior_log_odds
+        known = 0
+        for token in TOKEN_PATTERN.findall(message.lower()):
+            weight = ratio.get(token)
+            if weight is not None:
+                log_odds += weight
+                known += 1
+        log_odds -= known * self.denominator_log_ratio
+        if log_odds >= 0:
+            spam = 1.0 / (1.0 + math.exp(-log_odds))
+        else:
+            odds = math.exp(log_odds)
+            spam = odds / (1.0 + odds)
+        return self.classes[int(log_odds > 0)].item(), spam
+
+
+def append_feedback(log_path, messages, labels):
+    """Appends labelled messages to a JSONL feedback log and fsyncs it."""
+    with open(log_path, "a", encoding="utf-8") as f:
+        for message, label in zip(messages, labels):
+            f.write(json.dumps({"message": message, "label": int(label)}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def replay_feedback(model, log_path):
+    """Re-applies a feedback log to a freshly loaded model, in order, so the
+    model is rebuilt exactly. A torn last line from an interrupted write is
+    ignored. Returns the number of messages replayed."""
+    if not os.path.exists(log_path):
+        return 0
+    messages, labels = [], []
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            messages.append(record["message"])
+            labels.append(record["label"])
+    model.partial_fit(messages, labels)
+    return len(messages)
+
+
+def record_feedback(model, log_path, messages, labels):
+    """Logs labelled messages durably, then folds them into `model`.
+    Returns the number of tokens added to the vocabulary."""
+    append_feedback(log_path, messages, labels)
+    return model.partial_fit(messages, labels)
+
+
+def _split_chunks(data_path, chunksize, test_size, random_state):
+    """Yields (messages, labels, is_test) per CSV chunk. Rows are assigned to
+    the test split by a seeded draw, so every pass sees the same split."""
+    rng = np.random.default_rng(random_state)
+    for messages, labels in iter_chunks(data_path, chunksize):
+        yield np.array(messages, dtype=object), labels, rng.random(len(labels)) < test_size
+
+
+def train_streaming(data_path, test_size=0.3, random_state=42, alpha=1.0,
+                    chunksize=100000, n_features=2 ** 20):
+    """Out-of-core MultinomialNB training over a CSV of any size.
+
+    HashingVectorizer needs no fitted vocabulary, so the file is read in
+    chunks of `chunksize` rows (see spam_data.iter_chunks) and each chunk's
+    training rows update the Naive Bayes counts with partial_fit. A second
+    pass scores the held-out rows. Memory is bounded by the chunk size and
+    the (2 x n_features) count arrays, plus one byte per test row for the
+    labels.
+    Returns (vectorizer, model, y_test, y_pred).
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+
+    vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+    model = MultinomialNB(alpha=alpha)
+    for messages, labels, is_test in _split_chunks(data_path, chunksize, test_size, random_state):
+        train = ~is_test
+        if train.any():
+            model.partial_fit(vectorizer.transform(messages[train]), labels[train], classes=[0, 1])
+
+    y_test, y_pred = [], []
+    for messages, labels, is_test in _split_chunks(data_path, chunksize, test_size, random_state):
+        if is_test.any():
+            y_test.append(labels[is_test])
+            y_pred.append(model.predict(vectorizer.transform(messages[is_test])).astype(np.int8))
+    y_test = np.concatenate(y_test) if y_test else np.zeros(0, dtype=np.int8)
+    y_pred = np.concatenate(y_pred) if y_pred else np.zeros(0, dtype=np.int8)
+    return vectorizer, model, y_test, y_pred
+
+
+def load_or_train(data_path, artifact_path, hyperparams, train):
+    """Loads the artifact at `artifact_path` if it was trained on this exact
+    data file with these hyperparameters; otherwise calls
+    train(data_path, **hyperparams), which returns (vectorizer, model,
+    extra metadata), and saves the result.
+
+    The data hash is only recomputed when the file's size or mtime changed.
+    """
+    fingerprint = None
+    if os.path.exists(artifact_path):
+        meta = SpamModel.read_metadata(artifact_path)
+        if meta.get("version") == ARTIFACT_VERSION and meta.get("hyperparams") == hyperparams:
+            stat = os.stat(data_path)
+            data = meta["data"]
+            if (stat.st_size, stat.st_mtime) == (data["size"], data["mtime"]):
+                return SpamModel.load(artifact_path), False
+            fingerprint = data_fingerprint(data_path)
+            if fingerprint["sha256"] == data["sha256"]:
+                return SpamModel.load(artifact_path), False
+
+    if fingerprint is None:
+        fingerprint = data_fingerprint(data_path)
+    vectorizer, nb_model, extra = train(data_path, **hyperparams)
+    metadata = dict(extra, hyperparams=hyperparams, data=fingerprint, trained_at=time.time())
+    model = SpamModel.from_sklearn(vectorizer, nb_model, metadata)
+    model.save(artifact_path)
+    return model, True
@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import time
+
+from spam_model import SpamModel
+
+LABELS = {0: "ham", 1: "spam"}
+
+
+class Histogram:
+    """Counts of observations per bucket; `bounds` are the bucket upper edges
+    and the last bucket catches everything above them."""
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper edge of the bucket holding the q-quantile (None if empty or overflow)."""
+        if not self.total:
+            return None
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= q * self.total:
+                return bound
+        return None
+
+    def snapshot(self):
+        return {
+            "bounds": self.bounds,
+            "counts": self.counts,
+            "mean": self.sum / self.total if self.total else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MicroBatcher:
+    """Collects concurrent score requests into batches of at most
+    `max_batch_size` messages, waiting at most `max_wait` seconds after the
+    first one arrives, and scores each batch with one predict_proba call."""
+    def __init__(self, model, max_batch_size=64, max_wait=0.002):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        self.messages = 0
+        self.batches = 0
+        self.batch_sizes = Histogram(sorted({min(2 ** i, max_batch_size)
+                                             for i in range(max_batch_size.bit_length() + 1)}))
+        self.latency_ms = Histogram([0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000])
+
+    async def score(self, message):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((message, future, time.perf_counter()))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.score_batch(batch)
+
+    def score_batch(self, batch):
+        try:
+            probs = self.model.predict_proba([message for message, _, _ in batch])
+        except Exception as exc:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        labels = self.model.classes[probs.argmax(axis=1)]
+        now = time.perf_counter()
+        for (_, future, queued), label, prob in zip(batch, labels.tolist(), probs[:, 1].tolist()):
+            if not future.done():
+                future.set_result((label, prob))
+            self.latency_ms.observe((now - queued) * 1000)
+        self.messages += len(batch)
+        self.batches += 1
+        self.batch_sizes.observe(len(batch))
+
+    def metrics(self):
+        uptime = time.perf_counter() - self.started
+        return {
+            "uptime_s": uptime,
+            "messages": self.messages,
+            "batches": self.batches,
+            "throughput_msg_per_s": self.messages / uptime if uptime else 0.0,
+            "batch_size": self.batch_sizes.snapshot(),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+
+class ScoringServer:
+    """A small HTTP/1.1 front end for a MicroBatcher.
+
+    POST /score takes {"message": str} or {"messages": [str, ...]} and
+    answers with the prediction and spam probability for each;
+    GET /metrics returns the batcher's counters and histograms.
+    Connections are kept alive unless the client sends Connection: close.
+    """
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.route(method, target, body)
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, target, body):
+        if method == "GET" and target == "/metrics":
+            return "200 OK", self.batcher.metrics()
+        if method != "POST" or target != "/score":
+            return "404 Not Found", {"error": f"no route for {method} {target}"}
+        try:
+            request = json.loads(body)
+            single = "message" in request
+            messages = [request["message"]] if single else request["messages"]
+            if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return "400 Bad Request", {"error": 'expected {"message": str} or {"messages": [str, ...]}'}
+        results = await asyncio.gather(*(self.batcher.score(m) for m in messages))
+        results = [{"prediction": LABELS[label], "spam_probability": prob} for label, prob in results]
+        return "200 OK", results[0] if single else {"results": results}
+
+
+async def serve(model_path, host="127.0.0.1", port=8080, unix_path=None,
+                max_batch_size=64, max_wait=0.002):
+    batcher = MicroBatcher(SpamModel.load(model_path), max_batch_size, max_wait)
+    server = ScoringServer(batcher)
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle, unix_path)
+        where = unix_path
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+        where = f"http://{host}:{port}"
+    print(f"Serving {model_path} on {where} (batch <= {max_batch_size}, "
+          f"wait <= {max_wait * 1000:g} ms)", flush=True)
+    batch_task = asyncio.create_task(batcher.run())
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        batch_task.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the spam model over HTTP with micro-batching.")
+    parser.add_argument("--model", default="spam_model_multi.npz",
+                        help="artifact written by the spam scripts")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        parser.error(f"{args.model} not found; run Spam_Detection_UsingMultilpeInput.py to train it")
+    try:
+        asyncio.run(serve(args.model, args.host, args.port, args.unix,
+                          args.max_batch_size, args.max_wait_ms / 1000))
+    except KeyboardInterrupt:
+        pass